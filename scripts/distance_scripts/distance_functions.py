@@ -2,6 +2,7 @@ import os
 import json
 from typing import Any, Dict, List, Optional, Tuple
 from math import radians, sin, cos, atan2, sqrt
+import numpy as np
 from shapely.geometry import Point
 import folium
 from folium.features import DivIcon
@@ -31,6 +32,17 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
     return R * c
 
+def haversine_distances(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Calculate the great circle distances in meters from one point to arrays of points."""
+    R = 6371000  # Earth's radius in meters
+    lat, lon = radians(lat), radians(lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    dlat = lats - lat
+    dlon = lons - lon
+    a = np.sin(dlat / 2) ** 2 + cos(lat) * np.cos(lats) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
+
 def load_geojson(filename: str) -> Dict:
     """Load a GeoJSON file and return its contents as a dictionary.
     Raises FileNotFoundError if the file does not exist.
@@ -48,9 +60,8 @@ def find_nearest(ref_point: Point, data: Dict[str, Any]) -> Optional[Tuple[float
     """Find the nearest substation from the given dataset to the reference point.
     Returns a tuple of (distance_in_meters, feature_properties, (longitude, latitude)) or None.
     """
-    min_distance = float('inf')
-    nearest_station: Optional[Dict[str, Any]] = None
-    nearest_coords: Optional[Tuple[float, float]] = None
+    stations: List[Dict[str, Any]] = []
+    station_coords: List[Tuple[float, float]] = []
 
     for feature in data.get('features', []):
         geometry = feature.get('geometry', {})
@@ -63,29 +74,27 @@ def find_nearest(ref_point: Point, data: Dict[str, Any]) -> Optional[Tuple[float
             continue
 
         # coords is [longitude, latitude]
-        lon, lat = coords[0], coords[1]
-
         # Make sure we can convert them to float (in case they're not strictly float)
         try:
-            lon = float(lon)
-            lat = float(lat)
+            lon = float(coords[0])
+            lat = float(coords[1])
         except ValueError:
             continue  # If parsing fails, skip this feature
 
-        distance = haversine_distance(
-            lat1=ref_point.y, lon1=ref_point.x,
-            lat2=lat,        lon2=lon
-        )
+        stations.append(feature)
+        station_coords.append((lon, lat))
 
-        if distance < min_distance:
-            min_distance = distance
-            nearest_station = feature
-            nearest_coords = (lon, lat)
+    if not stations:
+        return None
 
-    if nearest_station is None or nearest_coords is None:
+    # All distances in one vectorized call instead of one call per station
+    lons, lats = np.array(station_coords).T
+    distances = haversine_distances(ref_point.y, ref_point.x, lats, lons)
+    if np.isnan(distances).all():
         return None
+    nearest = int(np.nanargmin(distances))
 
-    return (min_distance, nearest_station, nearest_coords)
+    return (float(distances[nearest]), stations[nearest], station_coords[nearest])
 
 def find_closest_substations(
     ref_point: Point,
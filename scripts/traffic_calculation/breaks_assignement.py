@@ -22,6 +22,35 @@ def create_point_gdf(df, lon_col, lat_col, crs=SPATIAL['DEFAULT_CRS']):
     ).drop(columns=[lon_col, lat_col])
     return gdf.to_crs(epsg=int(SPATIAL['TARGET_CRS'].split(':')[1]))
 
+# Sphere radius used by the Web Mercator projection (EPSG:3857)
+MERCATOR_RADIUS = 6378137.0
+
+def prefilter_breaks_near_location(df_breaks, lon, lat, buffer_radius):
+    """
+    Keep only breaks that can fall inside the buffer around a single location.
+    
+    Projects the break coordinates to Web Mercator with numpy and keeps those
+    within buffer_radius of the location. The buffer polygon is inscribed in
+    that circle, so no break inside the buffer is dropped; the exact spatial
+    joins then only run on the few remaining candidates.
+    
+    Args:
+        df_breaks: DataFrame with Latitude_B and Longitude_B columns
+        lon: Longitude of the location
+        lat: Latitude of the location
+        buffer_radius: Buffer radius in target CRS units
+    
+    Returns:
+        DataFrame with the candidate breaks
+    """
+    lon_rad = np.radians(df_breaks['Longitude_B'].to_numpy(dtype=float))
+    lat_rad = np.radians(df_breaks['Latitude_B'].to_numpy(dtype=float))
+    dx = MERCATOR_RADIUS * (lon_rad - np.radians(lon))
+    dy = MERCATOR_RADIUS * (np.log(np.tan(np.pi / 4 + lat_rad / 2)) - np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)))
+    # Small tolerance for rounding differences against the projection library
+    mask = dx * dx + dy * dy <= (buffer_radius * 1.001) ** 2
+    return df_breaks[mask]
+
 def calculate_scenarios(df_location, grouped_short, grouped_long):
     """
     Calculate charging scenarios (e.g. for 2030, 2035, 2040) using break counts.
@@ -48,20 +77,23 @@ def calculate_scenarios(df_location, grouped_short, grouped_long):
     
     return results_df
 
-def assign_breaks_to_locations(df_location, df_breaks, nuts_data_file, buffer_radius):
+def assign_breaks_to_locations(df_location, df_breaks, nuts_data_file, buffer_radius, location=None):
     """
     Assign breaks to a single location based on spatial proximity.
     
     Parameters:
     -----------
-    df_location : DataFrame
-        DataFrame containing a single location with latitude and longitude columns
+    df_location : DataFrame or None
+        DataFrame containing a single location with latitude and longitude columns;
+        may be None if location is given
     df_breaks : DataFrame
         DataFrame containing breaks data
     nuts_data_file : str
         Path to the NUTS GeoPackage file
     buffer_radius : int
         Radius in meters for the buffer around location
+    location : tuple, optional
+        (latitude, longitude) of a single location, used instead of df_location
         
     Returns:
     --------
@@ -72,12 +104,26 @@ def assign_breaks_to_locations(df_location, df_breaks, nuts_data_file, buffer_ra
         - 'long_breaks_count': Total number of long breaks assigned to the location
     """
     # Debug statements to verify location
-    print(f"DEBUG [breaks_assignment]: Location received = {df_location.to_dict()}")
+    if location is not None:
+        print(f"DEBUG [breaks_assignment]: Location received = {location}")
+        lat, lon = location
+        # The results are seeded from the location row
+        df_location = pd.DataFrame({'Laengengrad': [lon], 'Breitengrad': [lat]})
+    else:
+        print(f"DEBUG [breaks_assignment]: Location received = {df_location.to_dict()}")
+        if len(df_location) == 1:
+            lat = df_location['Breitengrad'].iloc[0]
+            lon = df_location['Laengengrad'].iloc[0]
     from config import Config
     from config_demand import get_default_location
     print(f"DEBUG [breaks_assignment]: Config.DEFAULT_LOCATION = {Config.DEFAULT_LOCATION}")
     print(f"DEBUG [breaks_assignment]: get_default_location() = {get_default_location()}")
     
+    # A single location only needs the breaks near it; this skips projecting
+    # and joining the full breaks table
+    if len(df_location) == 1 and SPATIAL['TARGET_CRS'] == 'EPSG:3857':
+        df_breaks = prefilter_breaks_near_location(df_breaks, lon, lat, buffer_radius)
+    
     # Load Germany NUTS data
     gdf_deutschland_nuts1 = gpd.read_file(nuts_data_file, layer='nuts5000_n1')
     
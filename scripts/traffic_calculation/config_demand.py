@@ -61,6 +61,7 @@ FILES = {
         
     # Output files
     'BREAKS_OUTPUT': os.path.join(OUTPUT_DIR, 'breaks.json'),
+    'BREAKS_PARQUET': os.path.join(OUTPUT_DIR, 'breaks.parquet'),
     'TOLL_MIDPOINTS_OUTPUT': os.path.join(OUTPUT_DIR, 'toll_midpoints.json'),
     'CHARGING_DEMAND': os.path.join(OUTPUT_DIR, 'charging_demand.json'),
     'FINAL_OUTPUT': os.path.join(FINAL_OUTPUT_DIR, 'laden_mauttabelle.json')
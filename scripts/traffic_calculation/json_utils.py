@@ -7,10 +7,34 @@ import pandas as pd
 import numpy as np
 import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor
 from config_demand import get_breaks_column, get_charging_column, year
 from pathlib import Path
 
-def dataframe_to_json(df, output_path, metadata=None, structure_type='demand'):
+# Optional fast JSON backend
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Output directories already created in this process
+_CREATED_DIRS = set()
+
+def ensure_dir(dir_path):
+    """
+    Create a directory including parents, skipping the filesystem call
+    for directories already created in this process.
+    
+    Args:
+        dir_path: Directory to create
+    """
+    dir_path = str(dir_path)
+    if dir_path not in _CREATED_DIRS:
+        Path(dir_path).mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(dir_path)
+
+def dataframe_to_json(df, output_path, metadata=None, structure_type='demand', pretty=False):
     """
     Convert a DataFrame to a clean JSON structure and save it to a file.
     
@@ -19,24 +43,27 @@ def dataframe_to_json(df, output_path, metadata=None, structure_type='demand'):
         output_path: Path to save the output file
         metadata: Dictionary with metadata
         structure_type: Type of structure to create ('demand', 'charging_sessions', etc.)
+        pretty: Indent the output for human inspection (default: compact JSON)
     """
     # Create initial data structure
     data_dict = {"metadata": metadata or {}, "data": {}}
     
     if structure_type == 'demand':
+        # Hash-based column lookup for the many membership tests below
+        cols = set(df.columns)
+        
         # Extract breaks data for all years
         breaks_data = {}
         for break_type in ["short", "long"]:
             for yr in ["2030", "2035", "2040", "2045"]:
                 # Try year-specific column first
                 col_name = f"{break_type}_breaks_{yr}"
-                if col_name in df.columns:
+                if col_name in cols:
                     breaks_data[col_name] = df[col_name].iloc[0] if not df.empty else 0
                 else:
                     # Fall back to general column if needed
-                    from config_demand import get_breaks_column
                     general_col = get_breaks_column(break_type)
-                    if general_col in df.columns:
+                    if general_col in cols:
                         breaks_data[col_name] = df[general_col].iloc[0] if not df.empty else 0
         
         data_dict["data"]["breaks"] = breaks_data
@@ -46,7 +73,7 @@ def dataframe_to_json(df, output_path, metadata=None, structure_type='demand'):
         for yr in ["2030", "2035", "2040", "2045"]:
             hpc_col = f"HPC_{yr}"
             ncs_col = f"NCS_{yr}"
-            if hpc_col in df.columns and ncs_col in df.columns:
+            if hpc_col in cols and ncs_col in cols:
                 charging_demand[yr] = {
                     "HPC": df[hpc_col].iloc[0] if not df.empty else 0,
                     "NCS": df[ncs_col].iloc[0] if not df.empty else 0
@@ -56,12 +83,12 @@ def dataframe_to_json(df, output_path, metadata=None, structure_type='demand'):
         
         # Extract daily demand pattern for all years
         days = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
-        daily_demand = {}
+        
+        # Resolve the source column of every daily value first
+        daily_sources = {}
         for day in days:
-            if day in df.columns:
-                daily_info = {
-                    "distribution_factor": df[day].iloc[0] if not df.empty else 0
-                }
+            if day in cols:
+                sources = {"distribution_factor": day}
                 
                 # Add HPC and NCS values for each year
                 for yr in ["2030", "2035", "2040", "2045"]:
@@ -70,23 +97,37 @@ def dataframe_to_json(df, output_path, metadata=None, structure_type='demand'):
                     ncs_day_col = f"{day}_NCS_{yr}"
                     
                     # Fall back to general day columns if needed
-                    if hpc_day_col not in df.columns:
+                    if hpc_day_col not in cols:
                         hpc_day_col = f"{day}_HPC"
-                    if ncs_day_col not in df.columns:
+                    if ncs_day_col not in cols:
                         ncs_day_col = f"{day}_NCS"
                     
-                    if hpc_day_col in df.columns:
-                        daily_info[f"HPC_{yr}"] = df[hpc_day_col].iloc[0] if not df.empty else 0
-                    if ncs_day_col in df.columns:
-                        daily_info[f"NCS_{yr}"] = df[ncs_day_col].iloc[0] if not df.empty else 0
+                    if hpc_day_col in cols:
+                        sources[f"HPC_{yr}"] = hpc_day_col
+                    if ncs_day_col in cols:
+                        sources[f"NCS_{yr}"] = ncs_day_col
                 
-                daily_demand[day] = daily_info
+                daily_sources[day] = sources
+        
+        # Fetch all needed columns of the first row in a single pass
+        wanted = list(dict.fromkeys(col for sources in daily_sources.values() for col in sources.values()))
+        first_row = df[wanted].iloc[0].to_dict() if not df.empty else dict.fromkeys(wanted, 0)
+        daily_demand = {
+            day: {key: first_row[col] for key, col in sources.items()}
+            for day, sources in daily_sources.items()
+        }
         
         data_dict["data"]["daily_demand"] = daily_demand
     
     # Other structure types remain unchanged
     elif structure_type == 'charging_sessions':
-        data_dict["data"] = df.to_dict(orient='index')
+        # Extract both session columns once instead of building a Series per row
+        hpc_sessions = df['HPC_Sessions'].astype(float).to_dict()
+        ncs_sessions = df['NCS_Sessions'].astype(float).to_dict()
+        data_dict["data"] = {
+            day: {"HPC_Sessions": hpc_sessions[day], "NCS_Sessions": ncs_sessions[day]}
+            for day in df.index
+        }
     
     elif structure_type == 'toll_midpoints':
         data_dict["data"]["toll_sections"] = df.to_dict(orient='records')
@@ -98,11 +139,37 @@ def dataframe_to_json(df, output_path, metadata=None, structure_type='demand'):
     clean_data = clean_json_structure(data_dict, structure_type)
     
     # Save to file
-    import json
-    import os
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    ensure_dir(Path(output_path).parent)
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(clean_data, option=option))
+        return
+    
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(clean_data, f, indent=2)
+        if pretty:
+            json.dump(clean_data, f, indent=2)
+        else:
+            json.dump(clean_data, f, separators=(',', ':'))
+
+def dataframes_to_json_batch(items):
+    """
+    Convert and save several DataFrames to JSON concurrently.
+    
+    Args:
+        items: Iterable of (df, output_path, metadata, structure_type[, pretty])
+               tuples, passed positionally to dataframe_to_json
+    """
+    items = list(items)
+    if not items:
+        return
+    
+    # Writing is I/O-bound, so threads are enough to overlap the files
+    with ThreadPoolExecutor(max_workers=min(len(items), os.cpu_count() or 1)) as executor:
+        # Consume the iterator so that exceptions from workers are raised here
+        list(executor.map(lambda item: dataframe_to_json(*item), items))
 
 def load_json_data(file_path):
     """
@@ -118,10 +185,18 @@ def load_json_data(file_path):
     if not file_path.exists():
         raise FileNotFoundError(f"{file_path} does not exist")
     
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    # Read the whole file in one go; json.loads detects the UTF-8 encoding itself
+    with open(file_path, 'rb', buffering=1 << 20) as f:
+        raw = f.read()
+    
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN literals the stdlib writer may have produced
+            pass
     
-    return data
+    return json.loads(raw)
 
 def json_to_dataframe(json_path_or_data):
     """
@@ -312,29 +387,30 @@ def clean_json_structure(data_dict, structure_type='demand'):
     # Other structure types remain the same
     elif structure_type == 'charging_sessions':
         # Existing charging_sessions code
+        # Split off the total row before building the per-day list
+        sessions_data = dict(data_dict.get("data", {}))
+        total = sessions_data.pop('Total', None)
+
         clean_data = {
             "metadata": data_dict.get("metadata", {}),
-            "data": []
-        }
-        
-        sessions_data = data_dict.get("data", {})
-        for day, row in sessions_data.items():
-            if day != 'Total':  # Skip the total row
-                clean_data["data"].append({
+            "data": [
+                {
                     "day": day,
                     "HPC_Sessions": round(row.get("HPC_Sessions", 0)),
                     "NCS_Sessions": round(row.get("NCS_Sessions", 0))
-                })
-        
+                }
+                for day, row in sessions_data.items()
+            ]
+        }
+
         # Add a summary section
-        if 'Total' in sessions_data:
+        if total is not None:
+            weeks_per_year = data_dict.get("metadata", {}).get("weeks_per_year", 52)
             clean_data["summary"] = {
-                "total_weekly_HPC": round(sessions_data.get('Total', {}).get("HPC_Sessions", 0)),
-                "total_weekly_NCS": round(sessions_data.get('Total', {}).get("NCS_Sessions", 0)),
-                "estimated_yearly_HPC": round(sessions_data.get('Total', {}).get("HPC_Sessions", 0) * 
-                                          data_dict.get("metadata", {}).get("weeks_per_year", 52)),
-                "estimated_yearly_NCS": round(sessions_data.get('Total', {}).get("NCS_Sessions", 0) * 
-                                          data_dict.get("metadata", {}).get("weeks_per_year", 52))
+                "total_weekly_HPC": round(total.get("HPC_Sessions", 0)),
+                "total_weekly_NCS": round(total.get("NCS_Sessions", 0)),
+                "estimated_yearly_HPC": round(total.get("HPC_Sessions", 0) * weeks_per_year),
+                "estimated_yearly_NCS": round(total.get("NCS_Sessions", 0) * weeks_per_year)
             }
             
     elif structure_type == 'toll_midpoints':
@@ -5,39 +5,38 @@ Orchestrates the overall workflow for break assignment, toll section matching, a
 
 import os
 import sys
+import json
 import logging
-from functools import wraps
+from functools import wraps, lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
-import geopandas as gpd
-import matplotlib.pyplot as plt
-
-from breaks_assignement import assign_breaks_to_locations
-from toll_matching import toll_section_matching_and_daily_demand, find_nearest_traffic_point, scale_charging_sessions
-from new_breaks import calculate_new_breaks
-from new_toll_midpoints import get_toll_midpoints
-from json_utils import dataframe_to_json, json_to_dataframe, load_json_data
+import numpy as np
+
+# pyarrow is optional; its multithreaded CSV reader is opt-in via FAST_IO=1
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+FAST_IO = os.environ.get('FAST_IO') == '1' and PYARROW_AVAILABLE
+
+from json_utils import dataframes_to_json_batch, json_to_dataframe, load_json_data, ensure_dir
 from config_demand import (FILES, OUTPUT_DIR, FINAL_OUTPUT_DIR, get_default_location, CSV, 
                            neue_pausen, neue_toll_midpoints, SPATIAL, year, TIME, 
-                           validate_year, get_charging_column, GERMAN_DAYS, SCENARIOS)
+                           validate_year, get_charging_column, GERMAN_DAYS, SCENARIOS,
+                           BREAKS, get_traffic_flow_column)
 
 # ------------------- Setup Logging -------------------
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Handlers are configured in _bootstrap() so importing this module has no side effects
 logger = logging.getLogger(__name__)
 
-# Create output directory structure
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(FINAL_OUTPUT_DIR, exist_ok=True)
-logger.info("Starting charging hub demand calculation...")
+# Weekday columns as an index, for reindexing traffic rows in one step
+GERMAN_DAYS_IDX = pd.Index(GERMAN_DAYS)
 
-# Validate the configured year
-try:
-    validate_year(year)
-    logger.info(f"Using forecast year: {year}")
-except ValueError as e:
-    logger.error(f"Invalid year configuration: {e}")
-    sys.exit(1)
+# Traffic count columns used downstream; the others are not loaded
+BEFAHRUNG_COLUMNS = ['Strecken-ID', *GERMAN_DAYS]
 
 # ------------------- Robust File Operation Functions -------------------
 def safe_file_operation(func):
@@ -55,109 +54,344 @@ def safe_file_operation(func):
     return wrapper
 
 @safe_file_operation
-def load_csv_file(file_path, skiprows=0, sep=CSV['DEFAULT_SEPARATOR'], decimal=CSV['DEFAULT_DECIMAL']):
+def load_csv_file(file_path, skiprows=0, sep=CSV['DEFAULT_SEPARATOR'], decimal=CSV['DEFAULT_DECIMAL'], usecols=None):
     """
     Load a CSV file with support for different encodings.
+    
+    usecols restricts parsing to the listed columns.
     """
     file_path = Path(file_path)
     logger.info(f"Loading CSV data from {file_path}")
-    df = pd.read_csv(file_path, sep=sep, skiprows=skiprows, decimal=decimal)
+    if FAST_IO:
+        return read_csv_pyarrow(file_path, skiprows=skiprows, sep=sep, decimal=decimal, usecols=usecols)
+    df = pd.read_csv(file_path, sep=sep, skiprows=skiprows, decimal=decimal, usecols=usecols, low_memory=False)
+    return df
+
+def read_csv_pyarrow(file_path, skiprows=0, sep=CSV['DEFAULT_SEPARATOR'], decimal=CSV['DEFAULT_DECIMAL'], usecols=None):
+    """
+    Load a CSV file with the multithreaded pyarrow parser.
+    
+    The pyarrow engine has no decimal option, so with a decimal comma the
+    affected columns arrive as strings and are converted afterwards.
+    """
+    df = pd.read_csv(file_path, sep=sep, skiprows=skiprows, usecols=usecols, engine='pyarrow')
+    if decimal != '.':
+        for col in df.select_dtypes(include='object').columns:
+            try:
+                df[col] = pd.to_numeric(df[col].str.replace(decimal, '.', regex=False))
+            except (ValueError, TypeError, AttributeError):
+                # Genuine text column, keep as is
+                continue
     return df
 
 @safe_file_operation
-def load_data_file(file_path, skiprows=0):
+def load_data_file(file_path, skiprows=0, usecols=None):
     """
     Load data from CSV, Excel, or JSON based on file extension.
+    
+    Parsed files are cached per process and keyed by path, modification time
+    and size, so loading an unchanged file again skips parsing it. Passing
+    usecols keeps only the listed columns, which for CSV and Parquet
+    also skips parsing the others.
     """
     file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"{file_path} does not exist")
     
+    stat = file_path.stat()
+    usecols = tuple(usecols) if usecols is not None else None
+    df = _load_data_file_cached(str(file_path), stat.st_mtime_ns, stat.st_size, skiprows, usecols)
+    # Shallow copy so callers adding or dropping columns leave the cached frame intact
+    return df.copy(deep=False)
+
+@lru_cache(maxsize=16)
+def _load_data_file_cached(path_str, mtime_ns, size, skiprows, usecols):
+    """Parse a data file; mtime_ns and size only serve as cache key."""
+    file_path = Path(path_str)
     suffix = file_path.suffix.lower()
+    columns = list(usecols) if usecols is not None else None
     if suffix == '.csv':
-        return load_csv_file(file_path, skiprows=skiprows)
+        df = load_csv_file(file_path, skiprows=skiprows, usecols=columns)
     elif suffix in ['.xlsx', '.xls']:
-        logger.info(f"Loading Excel data from {file_path}")
-        return pd.read_excel(file_path, skiprows=skiprows)
+        df = read_excel_cached(file_path, skiprows=skiprows)
+        if columns is not None:
+            df = df[columns]
     elif suffix == '.json':
         logger.info(f"Loading JSON data from {file_path}")
-        return json_to_dataframe(file_path)
+        df = json_to_dataframe(file_path)
+        if columns is not None:
+            df = df[columns]
+    elif suffix == '.parquet':
+        logger.info(f"Loading Parquet data from {file_path}")
+        df = pd.read_parquet(file_path, engine='pyarrow', columns=columns)
     else:
         raise ValueError(f"Unsupported file type: {file_path.suffix}")
+    return downcast_integers(df)
+
+def read_excel_cached(file_path, skiprows=0):
+    """
+    Load an Excel sheet through a Parquet sidecar file.
+    
+    Parsing xlsx is slow, so the first load writes the sheet next to the
+    source as <name>.skip<N>.parquet and later loads read that instead, as
+    long as it is newer than the workbook. Without pyarrow, or if the
+    sidecar cannot be written, the workbook is read directly.
+    
+    Args:
+        file_path: Path to the Excel file
+        skiprows: Number of rows to skip at the top of the sheet
+    
+    Returns:
+        DataFrame with the sheet contents
+    """
+    file_path = Path(file_path)
+    sidecar = file_path.with_name(f"{file_path.stem}.skip{skiprows}.parquet")
+    if PYARROW_AVAILABLE and sidecar.exists() and sidecar.stat().st_mtime_ns >= file_path.stat().st_mtime_ns:
+        logger.info(f"Loading cached Excel data from {sidecar}")
+        return pd.read_parquet(sidecar, engine='pyarrow')
+    
+    logger.info(f"Loading Excel data from {file_path}")
+    df = pd.read_excel(file_path, skiprows=skiprows)
+    if PYARROW_AVAILABLE:
+        try:
+            df.to_parquet(sidecar, engine='pyarrow', compression='zstd', index=False)
+        except (OSError, ValueError, TypeError) as e:
+            # Read-only input directory or mixed-type columns Parquet cannot store
+            logger.warning(f"Could not write Excel cache {sidecar}: {e}")
+            sidecar.unlink(missing_ok=True)
+    return df
+
+def downcast_integers(df):
+    """
+    Store 64-bit integer columns as int32 where their values fit.
+    
+    Traffic counts and section IDs fit comfortably, so the later filters and
+    lookups move half the bytes. int32 is the floor so that sums over
+    weekdays cannot overflow; float columns keep float64 because they hold
+    the coordinates used for distance calculations.
+    
+    Args:
+        df: DataFrame to downcast in place
+    
+    Returns:
+        The same DataFrame
+    """
+    info = np.iinfo(np.int32)
+    for col in df.select_dtypes(include='int64').columns:
+        values = df[col]
+        if not values.empty and info.min <= values.min() and values.max() <= info.max:
+            df[col] = values.astype(np.int32)
+    return df
 
-def save_dataframe(df, output_path, sep=CSV['DEFAULT_SEPARATOR'], decimal=CSV['DEFAULT_DECIMAL']):
-    """Save DataFrame to CSV file."""
+def save_dataframe(df, output_path, sep=CSV['DEFAULT_SEPARATOR'], decimal=CSV['DEFAULT_DECIMAL'], fmt=None):
+    """
+    Save DataFrame to CSV or Parquet file.
+    
+    Parquet is used when fmt is 'parquet' or the output path ends in
+    .parquet; it stores typed columns and needs no text parsing on reload.
+    With FAST_IO, CSV files with a '.' decimal are written by pyarrow's
+    multithreaded writer, which quotes all string values.
+    """
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, sep=sep, decimal=decimal, index=False)
+    ensure_dir(output_path.parent)
+    if fmt == 'parquet' or output_path.suffix.lower() == '.parquet':
+        df.to_parquet(output_path, engine='pyarrow', compression='zstd', index=False)
+    elif FAST_IO and decimal == '.' and len(sep) == 1:
+        write_csv_pyarrow(df, output_path, sep=sep)
+    else:
+        df.to_csv(output_path, sep=sep, decimal=decimal, index=False)
     logger.info(f"Data saved to {output_path}")
 
-def main():
-    # Add debugging for location
-    print(f"DEBUG [traffic_main]: Current location from get_default_location() = {get_default_location()}")
+def write_csv_pyarrow(df, output_path, sep=CSV['DEFAULT_SEPARATOR']):
+    """
+    Write a DataFrame as CSV with pyarrow's writer.
     
-    # Load shared data files once
-    logger.info("Loading shared data files...")
-    df_befahrung = load_data_file(FILES['BEFAHRUNGEN'])
+    pyarrow has no decimal option, so callers only use this for '.' decimals.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa_csv.write_csv(table, str(output_path), write_options=pa_csv.WriteOptions(delimiter=sep))
+
+# Records the inputs and settings the stored breaks were calculated from
+BREAKS_MANIFEST = os.path.join(OUTPUT_DIR, '.breaks.manifest.json')
+
+def breaks_fingerprint(input_dir):
+    """
+    Describe everything the breaks calculation depends on.
     
-    # Create a single reference location using the function instead of static import
-    current_location = get_default_location()
-    df_location = pd.DataFrame({
-        'Laengengrad': [current_location['LONGITUDE']],
-        'Breitengrad': [current_location['LATITUDE']]
-    })
+    Input files are identified by mtime and size, which is enough to notice
+    replaced or edited files without reading them.
+    
+    Args:
+        input_dir: Directory holding the traffic flow, edge and node files
+    
+    Returns:
+        JSON-compatible dict, or None if an input file is missing
+    """
+    inputs = {}
+    for key in ('TRAFFIC_FLOW', 'EDGES', 'NODES'):
+        path = os.path.join(input_dir, os.path.basename(FILES[key]))
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        inputs[path] = [stat.st_mtime_ns, stat.st_size]
+    
+    fingerprint = {
+        'inputs': inputs,
+        'traffic_flow_column': get_traffic_flow_column(),
+        'breaks_config': BREAKS
+    }
+    # Round-trip so tuples compare equal to the lists read back from disk
+    return json.loads(json.dumps(fingerprint))
+
+def breaks_inputs_changed(input_dir):
+    """Check whether the stored breaks are outdated compared to their inputs."""
+    fingerprint = breaks_fingerprint(input_dir)
+    if fingerprint is None:
+        # Without the raw inputs the breaks cannot be recalculated anyway
+        return False
+    try:
+        with open(BREAKS_MANIFEST, encoding='utf-8') as f:
+            return json.load(f) != fingerprint
+    except (FileNotFoundError, ValueError):
+        return True
+
+def write_breaks_manifest(input_dir):
+    """Atomically record the fingerprint of freshly calculated breaks."""
+    fingerprint = breaks_fingerprint(input_dir)
+    if fingerprint is None:
+        return
+    ensure_dir(OUTPUT_DIR)
+    tmp_path = f"{BREAKS_MANIFEST}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(fingerprint, f)
+    os.replace(tmp_path, BREAKS_MANIFEST)
+
+def load_breaks_output():
+    """
+    Load the calculated breaks, from their Parquet copy when it is current.
     
-    print(f"DEBUG [traffic_main]: df_location = {df_location.to_dict()}")
+    The Parquet copy is written right after the JSON file, so it is only
+    used if it is not older than the JSON file.
     
-    # Handle breaks calculation
+    Returns:
+        DataFrame with the breaks
+    """
+    json_path = Path(FILES['BREAKS_OUTPUT'])
+    parquet_path = Path(FILES['BREAKS_PARQUET'])
+    if (PYARROW_AVAILABLE and json_path.exists() and parquet_path.exists()
+            and parquet_path.stat().st_mtime_ns >= json_path.stat().st_mtime_ns):
+        return pd.read_parquet(parquet_path, engine='pyarrow')
+    return json_to_dataframe(FILES['BREAKS_OUTPUT'])
+
+def load_or_calculate_breaks():
+    """
+    Load breaks from JSON, or calculate them if requested, if no file
+    exists or if their inputs changed since the last calculation.
+    """
+    # Pass the correct input directory path
+    input_dir = os.path.dirname(FILES['TRAFFIC_FLOW'])
     if neue_pausen:
         logger.info("Calculating new breaks...")
-        # Pass the correct input directory path
-        input_dir = os.path.dirname(FILES['TRAFFIC_FLOW'])
-        df_breaks = calculate_new_breaks(base_path=input_dir)
+    elif breaks_inputs_changed(input_dir):
+        logger.info("Break inputs changed since the last calculation. Calculating new breaks...")
     else:
-        # Load breaks from JSON if file exists, otherwise calculate new breaks
+        # Load breaks from file if it exists, otherwise calculate new breaks
         try:
-            df_breaks = json_to_dataframe(FILES['BREAKS_OUTPUT'])
+            return load_breaks_output()
         except FileNotFoundError:
             logger.warning(f"Breaks file not found at {FILES['BREAKS_OUTPUT']}. Calculating new breaks.")
-            input_dir = os.path.dirname(FILES['TRAFFIC_FLOW'])
-            df_breaks = calculate_new_breaks(base_path=input_dir)
-    
-    # Handle toll midpoints calculation
-    df_mauttabelle = get_toll_midpoints(
-        FILES['MAUT_TABLE'], 
-        FILES['TOLL_MIDPOINTS_OUTPUT'], 
-        skiprows=1,
-        force_recalculate=neue_toll_midpoints
-    )
+    
+    # Deferred: the break calculation modules are only needed on recalculation
+    from new_breaks import calculate_new_breaks
+    df_breaks = calculate_new_breaks(base_path=input_dir)
+    write_breaks_manifest(input_dir)
+    return df_breaks
+
+def build_results_df():
+    """
+    Load the shared inputs, assign breaks to the configured location and
+    match it to its reference toll section.
+    
+    Returns:
+        Tuple of (results_df, df_befahrung, df_mauttabelle, reference_id)
+    """
+    # Deferred so that importing this module does not pull in geopandas
+    from breaks_assignement import assign_breaks_to_locations
+    from toll_matching import toll_section_matching_and_daily_demand, find_nearest_traffic_point
+    from new_toll_midpoints import get_toll_midpoints
+    
+    # Add debugging for location
+    print(f"DEBUG [traffic_main]: Current location from get_default_location() = {get_default_location()}")
+    
+    # Create a single reference location using the function instead of static import
+    current_location = get_default_location()
+    location = (current_location['LATITUDE'], current_location['LONGITUDE'])
+    
+    print(f"DEBUG [traffic_main]: location = {location}")
+    
+    # Traffic counts, breaks and toll midpoints are independent of each other,
+    # so load them concurrently (parsing and GEOS calls release the GIL)
+    logger.info("Loading shared data files...")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        befahrung_future = executor.submit(load_data_file, FILES['BEFAHRUNGEN'], usecols=BEFAHRUNG_COLUMNS)
+        breaks_future = executor.submit(load_or_calculate_breaks)
+        toll_future = executor.submit(
+            get_toll_midpoints,
+            FILES['MAUT_TABLE'], 
+            FILES['TOLL_MIDPOINTS_OUTPUT'], 
+            skiprows=1,
+            force_recalculate=neue_toll_midpoints
+        )
+        df_befahrung = befahrung_future.result()
+        df_breaks = breaks_future.result()
+        df_mauttabelle = toll_future.result()
     
     # Process breaks and assign to locations
     logger.info("Assigning breaks to locations...")
     breaks_results = assign_breaks_to_locations(
-        df_location, df_breaks, FILES['NUTS_DATA'], SPATIAL['BUFFER_RADIUS']
+        None, df_breaks, FILES['NUTS_DATA'], SPATIAL['BUFFER_RADIUS'], location=location
     )
     
     # Extract components from the dictionary
     results_df = breaks_results['results_df']
-    short_breaks_count = breaks_results['short_breaks_count']
-    long_breaks_count = breaks_results['long_breaks_count']
     
     # Match toll sections and calculate daily demand
     logger.info("Matching toll sections and calculating daily demand...")
     results_df = toll_section_matching_and_daily_demand(results_df, df_mauttabelle, df_befahrung)
     
     # Find nearest traffic point and scale charging sessions
-    lat = df_location['Breitengrad'].iloc[0]
-    lon = df_location['Laengengrad'].iloc[0]
-    reference_id = find_nearest_traffic_point(lat, lon, df_mauttabelle, df_befahrung)
+    reference_id = find_nearest_traffic_point(*location, df_mauttabelle, df_befahrung)
     logger.info(f"Reference toll section ID: {reference_id}")
+    
+    return results_df, df_befahrung, df_mauttabelle, reference_id
 
+def scale_for_year(results_df, target_year, df_befahrung, df_mauttabelle, reference_id):
+    """
+    Write the demand results and the scaled charging sessions for one year.
+    
+    The DataFrames from build_results_df are only read, so they can be
+    shared between calls without copying.
+    
+    Args:
+        results_df: Results from build_results_df
+        target_year: Forecast year whose charging columns are used
+        df_befahrung: Traffic counts per toll section
+        df_mauttabelle: Toll sections with midpoints
+        reference_id: ID of the reference toll section
+    """
+    # Index toll sections and traffic counts by ID for the lookups below
+    # (drop_duplicates keeps the first row per ID, as the former masks did)
+    maut_by_id = df_mauttabelle.drop_duplicates('Abschnitts-ID').set_index('Abschnitts-ID')
+    befahrung_by_id = df_befahrung.drop_duplicates('Strecken-ID').set_index('Strecken-ID')
+    
     # Create enriched metadata with toll section information
     current_location = get_default_location()
     metadata = {
         "forecast_years": SCENARIOS['TARGET_YEARS'],  # Include all target years
-        "forecast_year": year,  # Keep current year for backward compatibility
+        "forecast_year": target_year,  # Year the charging sessions are scaled for
         "base_year": year,
         "buffer_radius_m": SPATIAL['BUFFER_RADIUS'],
         "location": {
@@ -166,23 +400,30 @@ def main():
         },
         "toll_section": {
             "id": reference_id,
-            "highway": df_mauttabelle[df_mauttabelle['Abschnitts-ID'] == reference_id]['Bundesfernstraße'].iloc[0] if reference_id in df_mauttabelle['Abschnitts-ID'].values else "Unknown"
+            "highway": maut_by_id.at[reference_id, 'Bundesfernstraße'] if reference_id in maut_by_id.index else "Unknown"
         }
     }
     
     # Add traffic information if available
-    if reference_id in df_befahrung['Strecken-ID'].values:
-        traffic_data = df_befahrung[df_befahrung['Strecken-ID'] == reference_id].iloc[0]
-        metadata["toll_section"]["traffic"] = {day: int(traffic_data[day]) for day in GERMAN_DAYS if day in traffic_data}
+    if reference_id in befahrung_by_id.index:
+        traffic_data = befahrung_by_id.loc[reference_id]
+        metadata["toll_section"]["traffic"] = traffic_data.reindex(GERMAN_DAYS_IDX).dropna().astype('int64').to_dict()
 
-    # Save results as structured JSON
-    dataframe_to_json(results_df, FILES['FINAL_OUTPUT'], metadata=metadata, structure_type='demand')
+    # Collect structured JSON outputs and write them together at the end;
+    # a CSV or Parquet final output is written directly as a flat table
+    if FILES['FINAL_OUTPUT'].endswith('.json'):
+        json_outputs = [(results_df, FILES['FINAL_OUTPUT'], metadata, 'demand', True)]
+    else:
+        save_dataframe(results_df, FILES['FINAL_OUTPUT'])
+        json_outputs = []
+    
+    from toll_matching import scale_charging_sessions
     
     # Calculate robust charging demand scaling
     try:
         # Use pre-calculated values from results_df with dynamic column names
-        hpc_col = get_charging_column('HPC', year)
-        ncs_col = get_charging_column('NCS', year)
+        hpc_col = get_charging_column('HPC', target_year)
+        ncs_col = get_charging_column('NCS', target_year)
         annual_hpc_sessions = results_df[hpc_col].iloc[0]  
         annual_ncs_sessions = results_df[ncs_col].iloc[0]
 
@@ -195,11 +436,11 @@ def main():
             df_befahrung=df_befahrung
         )
         
-        # Add detailed logging of HPC sessions - FIXED: Removed duplicate logging section
-        logger.info("Daily HPC charging sessions breakdown:")
-        weekday_sessions = robust_sessions.loc[robust_sessions.index != 'Total', 'HPC_Sessions']
-        for day, sessions in weekday_sessions.items():
-            logger.info(f"  {day}: {sessions:.0f} sessions")
+        # Add detailed logging of HPC sessions as a single record
+        if logger.isEnabledFor(logging.INFO):
+            weekday_sessions = robust_sessions.loc[robust_sessions.index != 'Total', 'HPC_Sessions']
+            breakdown = "\n".join(f"  {day}: {sessions:.0f} sessions" for day, sessions in weekday_sessions.items())
+            logger.info(f"Daily HPC charging sessions breakdown:\n{breakdown}")
         
         weekly_total = robust_sessions.loc['Total', 'HPC_Sessions']
         yearly_total = weekly_total * TIME['WEEKS_PER_YEAR']
@@ -207,20 +448,53 @@ def main():
         logger.info(f"Weekly HPC sessions: {weekly_total:.0f}")
         logger.info(f"Yearly HPC sessions: {yearly_total:.0f} (estimated from weekly pattern)")
         
-        # Save charging demand as structured JSON
+        # Queue charging demand for the structured JSON output
         charging_metadata = {
             "reference_toll_section_id": reference_id,
             "weeks_per_year": TIME['WEEKS_PER_YEAR'],
-            "forecast_year": year
+            "forecast_year": target_year
         }
-        dataframe_to_json(robust_sessions, FILES['CHARGING_DEMAND'], 
-                          metadata=charging_metadata, structure_type='charging_sessions')
+        json_outputs.append((robust_sessions, FILES['CHARGING_DEMAND'], charging_metadata, 'charging_sessions', True))
         
         logger.info("Scaling of charging sessions completed")
     except Exception as e:
         logger.error(f"Error in scaling: {e}")
     
+    # Save results and charging demand as structured JSON
+    dataframes_to_json_batch(json_outputs)
+    
     logger.info(f"Processing complete. Final results saved to {FILES['FINAL_OUTPUT']}")
 
+def main():
+    # The breaks depend on the configured year's traffic flows, so the shared
+    # results are only valid for that year
+    results_df, df_befahrung, df_mauttabelle, reference_id = build_results_df()
+    scale_for_year(results_df, year, df_befahrung, df_mauttabelle, reference_id)
+
+def _bootstrap():
+    """Set up logging and output directories and validate the configured year."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    # Copy-on-write spares defensive deep copies when frames are derived from
+    # each other. It is always on from pandas 3, where the option is deprecated.
+    # Set here rather than at import, so importing the modules never changes
+    # pandas behaviour for the importing process.
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+    
+    # Create output directory structure
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(FINAL_OUTPUT_DIR, exist_ok=True)
+    logger.info("Starting charging hub demand calculation...")
+    
+    # Validate the configured year
+    try:
+        validate_year(year)
+        logger.info(f"Using forecast year: {year}")
+    except ValueError as e:
+        logger.error(f"Invalid year configuration: {e}")
+        sys.exit(1)
+
 if __name__ == "__main__":
+    _bootstrap()
     main()
\ No newline at end of file
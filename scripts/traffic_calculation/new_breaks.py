@@ -7,14 +7,31 @@ import time
 import pandas as pd
 import numpy as np
 import logging
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Any
-from functools import lru_cache
+from itertools import chain
 from config_demand import BREAKS, FILES, CSV, get_traffic_flow_column, year
 from json_utils import dataframe_to_json, json_to_dataframe
 
+# pyarrow is optional; its multithreaded CSV reader is opt-in via FAST_IO=1
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+FAST_IO = os.environ.get('FAST_IO') == '1' and PYARROW_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
-@lru_cache(maxsize=1024)
+# Below this many trip edges in total, both cohorts are walked in this process;
+# starting worker processes would take longer than the walks themselves
+PARALLEL_MIN_EDGES = 2_000_000
+
+# Break types in code order; Break_Type is stored as int8 codes into this list
+BREAK_TYPES = ['short', 'long']
+
 def parse_edge_string(edge_str: str) -> list:
     """
     Parse a string containing edge IDs in square brackets into a list of integers.
@@ -36,6 +53,70 @@ def parse_edge_string(edge_str: str) -> list:
         return []
 
 
+def parse_edge_column(edge_strings: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a column of edge strings straight into a flattened edge array.
+    
+    All paths are joined and tokenized by numpy in a single call. If any row
+    is malformed, the column is parsed row by row with parse_edge_string
+    instead, so bad rows still end up as empty trips.
+    
+    Args:
+        edge_strings: Series of edge ID strings in square brackets format
+    
+    Returns:
+        Tuple of (edges_flat, offsets) as returned by flatten_trip_edges
+    """
+    cleaned = edge_strings.fillna('').astype(str).str.strip('[]')
+    lengths = cleaned.str.count(',').to_numpy(dtype=np.int64) + 1
+    lengths[(cleaned.str.strip() == '').to_numpy()] = 0
+    
+    joined = ','.join(text for text in cleaned.tolist() if text.strip())
+    try:
+        with warnings.catch_warnings():
+            # Older numpy only warns about unparsable text
+            warnings.simplefilter('error', DeprecationWarning)
+            edges_flat = np.fromstring(joined, dtype=np.int64, sep=',') if joined else np.empty(0, dtype=np.int64)
+    except (ValueError, DeprecationWarning):
+        edges_flat = None
+    
+    if edges_flat is None or len(edges_flat) != lengths.sum():
+        return flatten_trip_edges([parse_edge_string(s) for s in edge_strings.tolist()])
+    
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return edges_flat, offsets
+
+
+# Known column types of the network inputs; ID columns are left to inference
+# so that a gap in an ID column does not abort the read
+TRAFFIC_FLOW_DTYPES = {
+    'Edge_path_E_road': 'str',
+    'Distance_from_origin_region_to_E_road': 'float64',
+    'Distance_within_E_road': 'float64'
+}
+EDGES_DTYPES = {'Distance': 'float64'}
+NODES_DTYPES = {'Network_Node_X': 'float64', 'Network_Node_Y': 'float64'}
+
+
+def read_network_csv(file_path: str, dtype: Dict[str, str]) -> pd.DataFrame:
+    """
+    Read one of the comma-separated network input files.
+    
+    With FAST_IO the file is parsed by pyarrow's multithreaded reader.
+    
+    Args:
+        file_path: Path to the CSV file
+        dtype: Column types of known columns
+    
+    Returns:
+        DataFrame indexed by the first column
+    """
+    if FAST_IO:
+        return pd.read_csv(file_path, sep=',', index_col=0, dtype=dtype, engine='pyarrow')
+    return pd.read_csv(file_path, sep=',', decimal='.', index_col=0, dtype=dtype)
+
+
 def load_data(base_path: str) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Load input data from CSV files.
@@ -54,9 +135,9 @@ def load_data(base_path: str) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
     edges_path = os.path.join(input_dir, os.path.basename(FILES['EDGES']))
     nodes_path = os.path.join(input_dir, os.path.basename(FILES['NODES']))
     
-    df_traffic_flow = pd.read_csv(traffic_flow_path, sep=',', decimal='.', index_col=0)
-    df_edges = pd.read_csv(edges_path, sep=',', decimal='.', index_col=0)
-    df_nodes = pd.read_csv(nodes_path, sep=',', decimal='.', index_col=0)
+    df_traffic_flow = read_network_csv(traffic_flow_path, TRAFFIC_FLOW_DTYPES)
+    df_edges = read_network_csv(edges_path, EDGES_DTYPES)
+    df_nodes = read_network_csv(nodes_path, NODES_DTYPES)
     
     logger.info(f"Loaded {len(df_traffic_flow)} traffic flows, {len(df_edges)} edges, {len(df_nodes)} nodes")
     
@@ -67,6 +148,9 @@ def filter_traffic_flows(df_traffic_flow: pd.DataFrame) -> Tuple[pd.DataFrame, p
     """
     Filter traffic flows into single-driver and two-driver categories.
     
+    Only the columns used by the break calculation are copied into the
+    returned frames. The input frame is not modified.
+    
     Args:
         df_traffic_flow: DataFrame with traffic flow data
     
@@ -76,66 +160,186 @@ def filter_traffic_flows(df_traffic_flow: pd.DataFrame) -> Tuple[pd.DataFrame, p
     max_singledriver_dist = BREAKS['MAX_DISTANCE_SINGLEDRIVER']
     
     # Calculate total distance once
-    df_traffic_flow['total_distance'] = (
-        df_traffic_flow['Distance_from_origin_region_to_E_road'] + 
-        df_traffic_flow['Distance_within_E_road']
+    total_distance = np.add(
+        df_traffic_flow['Distance_from_origin_region_to_E_road'].to_numpy(),
+        df_traffic_flow['Distance_within_E_road'].to_numpy()
     )
+    has_traffic = df_traffic_flow['Traffic_flow_trucks_2030'].to_numpy() > 0
     
     # Filter for single-driver trips
-    single_driver_mask = (
-        (df_traffic_flow['total_distance'] > 0) & 
-        (df_traffic_flow['total_distance'] <= max_singledriver_dist) & 
-        (df_traffic_flow['Traffic_flow_trucks_2030'] > 0)
-    )
+    single_driver_mask = (total_distance > 0) & (total_distance <= max_singledriver_dist) & has_traffic
     
     # Filter for two-driver trips
-    two_driver_mask = (
-        (df_traffic_flow['total_distance'] > max_singledriver_dist) & 
-        (df_traffic_flow['Traffic_flow_trucks_2030'] > 0)
-    )
+    two_driver_mask = (total_distance > max_singledriver_dist) & has_traffic
     
-    df_single_driver = df_traffic_flow[single_driver_mask].copy().reset_index(drop=True)
-    df_two_driver = df_traffic_flow[two_driver_mask].copy().reset_index(drop=True)
+    columns = list(dict.fromkeys([
+        'Edge_path_E_road', 'Distance_from_origin_region_to_E_road', get_traffic_flow_column()
+    ]))
+    df_used = df_traffic_flow[columns]
+    
+    # Boolean indexing already returns new frames; only their index is replaced
+    df_single_driver = df_used[single_driver_mask]
+    df_single_driver.index = pd.RangeIndex(len(df_single_driver))
+    df_two_driver = df_used[two_driver_mask]
+    df_two_driver.index = pd.RangeIndex(len(df_two_driver))
     
     logger.info(f"Filtered {len(df_single_driver)} single-driver and {len(df_two_driver)} two-driver trips")
     
     return df_single_driver, df_two_driver
 
 
-def create_lookup_dictionaries(df_edges: pd.DataFrame, df_nodes: pd.DataFrame) -> Dict[str, Dict]:
+def _dense_lookup(ids: pd.Series, values: pd.Series, dtype) -> np.ndarray:
+    """Scatter values into a zero-filled array indexed by ID."""
+    ids = ids.to_numpy(dtype=np.int64)
+    valid = ids >= 0
+    table = np.zeros(int(ids[valid].max()) + 1 if valid.any() else 0, dtype=dtype)
+    table[ids[valid]] = values.to_numpy(dtype=dtype)[valid]
+    return table
+
+
+def lookup_ids(table: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """
+    Look up IDs in a dense lookup array, with 0 for IDs outside the table.
+    
+    Args:
+        table: Dense lookup array from create_lookup_arrays
+        ids: Array of edge or node IDs
+    
+    Returns:
+        Array of looked-up values
+    """
+    valid = (ids >= 0) & (ids < len(table))
+    return np.where(valid, table[np.where(valid, ids, 0)] if len(table) else 0, 0).astype(table.dtype)
+
+
+def create_lookup_arrays(df_edges: pd.DataFrame, df_nodes: pd.DataFrame) -> Dict[str, np.ndarray]:
     """
-    Create lookup dictionaries for efficient data access.
+    Create dense lookup arrays indexed by edge and node ID.
+    
+    Edge and node IDs are small integers, so an array lookup replaces a
+    dictionary probe per edge. IDs missing from the tables map to 0.
     
     Args:
         df_edges: DataFrame with edge data
         df_nodes: DataFrame with node data
     
     Returns:
-        Dictionary containing lookup dictionaries
+        Dictionary containing lookup arrays
     """
+    edge_ids = df_edges['Network_Edge_ID']
+    node_ids = df_nodes['Network_Node_ID']
     return {
-        'edge_length': df_edges.set_index('Network_Edge_ID')['Distance'].to_dict(),
-        'edge_node_b': df_edges.set_index('Network_Edge_ID')['Network_Node_B_ID'].to_dict(),
-        'node_lat': df_nodes.set_index('Network_Node_ID')['Network_Node_Y'].to_dict(),
-        'node_lon': df_nodes.set_index('Network_Node_ID')['Network_Node_X'].to_dict()
+        'edge_length': _dense_lookup(edge_ids, df_edges['Distance'], np.float64),
+        'edge_node_b': _dense_lookup(edge_ids, df_edges['Network_Node_B_ID'], np.int64),
+        'node_lat': _dense_lookup(node_ids, df_nodes['Network_Node_Y'], np.float64),
+        'node_lon': _dense_lookup(node_ids, df_nodes['Network_Node_X'], np.float64)
     }
 
 
-def process_single_driver_breaks(
-    trip_edges_list: List[List[int]], 
+def flatten_trip_edges(trip_edges_list: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten per-trip edge lists into one edge array plus trip offsets.
+    
+    The edges of trip i are edges_flat[offsets[i]:offsets[i + 1]].
+    
+    Args:
+        trip_edges_list: List of edge ID lists for each trip
+    
+    Returns:
+        Tuple of (edges_flat, offsets)
+    """
+    lengths = np.fromiter((len(edges) for edges in trip_edges_list), dtype=np.int64, count=len(trip_edges_list))
+    offsets = np.zeros(len(trip_edges_list) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    edges_flat = np.fromiter(chain.from_iterable(trip_edges_list), dtype=np.int64, count=int(offsets[-1]))
+    return edges_flat, offsets
+
+
+def draw_break_thresholds(n_edges: int) -> np.ndarray:
+    """
+    Draw the break distance threshold for every edge of a cohort in one call.
+    
+    Uses the global legacy generator, so a seeded run yields the same
+    thresholds as drawing them one edge at a time. An empty RANDOM_RANGE
+    such as (0, 0) means no random variation.
+    
+    Args:
+        n_edges: Number of edges in the flattened edge array
+    
+    Returns:
+        Array of thresholds, one per edge
+    """
+    low, high = BREAKS['RANDOM_RANGE']
+    if high <= low:
+        return np.full(n_edges, BREAKS['DISTANCE_THRESHOLD'], dtype=np.int64)
+    return BREAKS['DISTANCE_THRESHOLD'] + np.random.randint(low, high, size=n_edges)
+
+
+def _walk_trip_edges(
+    edge_lengths: List[float],
+    thresholds: List[int],
+    offsets: List[int],
+    origin_distances: List[float]
+) -> np.ndarray:
+    """
+    Walk every trip edge by edge and record where the driver takes a break.
+    
+    This is the hot loop shared by both driver cohorts. It only accumulates
+    distances and writes each break position into a preallocated array; trip
+    and break numbers are derived from the positions afterwards.
+    
+    Args:
+        edge_lengths: Length of every edge in the flattened edge array
+        thresholds: Break distance threshold for every edge
+        offsets: Trip offsets into the flattened edge array
+        origin_distances: List of distances from origin to E-road
+    
+    Returns:
+        Ascending positions of the break edges in the flattened edge array
+    """
+    # A trip cannot have more breaks than edges
+    positions = np.empty(len(edge_lengths), dtype=np.int64)
+    n_breaks = 0
+    
+    for trip_idx, travel_distance in enumerate(origin_distances):
+        start = offsets[trip_idx]
+        end = offsets[trip_idx + 1]
+        
+        for pos in range(start, end):
+            travel_distance += edge_lengths[pos]
+            
+            if travel_distance > thresholds[pos]:
+                travel_distance = 0
+                positions[n_breaks] = pos
+                n_breaks += 1
+    
+    return positions[:n_breaks]
+
+
+def _collect_breaks(
+    edges_flat: np.ndarray,
+    offsets: np.ndarray,
     origin_distances: List[float],
     traffic_flows: List[float],
-    lookups: Dict[str, Dict],
+    lookups: Dict[str, np.ndarray],
+    driver: int,
+    short_breaks_per_long: int,
     random_seed: int = None
-) -> Dict[str, List]:
+) -> Dict[str, np.ndarray]:
     """
-    Process breaks for single-driver trips using vectorized operations where possible.
+    Run the break walk for one driver cohort and look up the break locations.
+    
+    Breaks follow a fixed cycle per trip: short_breaks_per_long short breaks,
+    then one long break. Break_Type holds int8 codes into BREAK_TYPES.
     
     Args:
-        trip_edges_list: List of edge ID lists for each trip
+        edges_flat: Edge IDs of all trips, flattened
+        offsets: Trip offsets into edges_flat
         origin_distances: List of distances from origin to E-road
         traffic_flows: List of traffic flows for each trip
-        lookups: Dictionary with lookup dictionaries
+        lookups: Dictionary with lookup arrays
+        driver: Number of drivers of the cohort
+        short_breaks_per_long: Number of short breaks before each long break
         random_seed: Seed for random number generation (optional)
     
     Returns:
@@ -144,155 +348,92 @@ def process_single_driver_breaks(
     if random_seed is not None:
         np.random.seed(random_seed)
     
-    trip_distance_threshold = BREAKS['DISTANCE_THRESHOLD']
-    random_range = BREAKS['RANDOM_RANGE']
-    
-    # Pre-allocate results
-    breaks_data = {
-        'Trip_ID': [],
-        'Driver': [],
-        'Break_Nr': [],
-        'Break_Type': [],
-        'Edge': [],
-        'Edge_length': [],
-        'Node_B': [],
-        'Latitude_B': [],
-        'Longitude_B': [],
-        'Break_Number': []
+    edge_lengths = lookup_ids(lookups['edge_length'], edges_flat)
+    
+    thresholds = draw_break_thresholds(len(edges_flat))
+    
+    positions = _walk_trip_edges(
+        edge_lengths.tolist(), thresholds.tolist(), offsets.tolist(), np.asarray(origin_distances).tolist()
+    )
+    
+    # Positions ascend, so each trip's breaks are contiguous and numbered from 1
+    trip_ids = np.searchsorted(offsets, positions, side='right') - 1
+    break_nrs = np.arange(len(positions)) - np.searchsorted(trip_ids, trip_ids, side='left') + 1
+    break_edges = edges_flat[positions]
+    node_ids = lookup_ids(lookups['edge_node_b'], break_edges)
+    
+    is_short = (break_nrs - 1) % (short_breaks_per_long + 1) < short_breaks_per_long
+    
+    return {
+        'Trip_ID': trip_ids,
+        'Driver': np.full(len(trip_ids), driver),
+        'Break_Nr': break_nrs,
+        'Break_Type': np.where(is_short, 0, 1).astype(np.int8),
+        'Edge': break_edges,
+        'Edge_length': edge_lengths[positions],
+        'Node_B': node_ids,
+        'Latitude_B': lookup_ids(lookups['node_lat'], node_ids),
+        'Longitude_B': lookup_ids(lookups['node_lon'], node_ids),
+        'Break_Number': np.asarray(traffic_flows)[trip_ids]
     }
+
+
+def process_single_driver_breaks(
+    edges_flat: np.ndarray,
+    offsets: np.ndarray,
+    origin_distances: List[float],
+    traffic_flows: List[float],
+    lookups: Dict[str, np.ndarray],
+    random_seed: int = None
+) -> Dict[str, np.ndarray]:
+    """
+    Process breaks for single-driver trips (odd breaks are short, even breaks long).
     
-    # Process each trip
-    for trip_idx, edge_list in enumerate(trip_edges_list):
-        if not edge_list:
-            continue
-            
-        travel_distance = origin_distances[trip_idx]
-        breaks = 0
-        
-        for edge_id in edge_list:
-            travel_distance += lookups['edge_length'].get(edge_id, 0)
-            
-            # Random threshold with optimization to avoid generating a random number each time
-            threshold = trip_distance_threshold + np.random.randint(*random_range)
-            
-            if travel_distance > threshold:
-                travel_distance = 0
-                breaks += 1
-                
-                break_edge_id = edge_id
-                break_edge_length = lookups['edge_length'].get(break_edge_id, 0)
-                break_node_id = lookups['edge_node_b'].get(edge_id, 0)
-                break_node_lat = lookups['node_lat'].get(break_node_id, 0)
-                break_node_lon = lookups['node_lon'].get(break_node_id, 0)
-                break_traffic_number = traffic_flows[trip_idx]
-                
-                # Determine break type (odd = short, even = long)
-                break_type = 'short' if breaks % 2 == 1 else 'long'
-                
-                # Append to results
-                breaks_data['Trip_ID'].append(trip_idx)
-                breaks_data['Driver'].append(1)
-                breaks_data['Break_Nr'].append(breaks)
-                breaks_data['Break_Type'].append(break_type)
-                breaks_data['Edge'].append(break_edge_id)
-                breaks_data['Edge_length'].append(break_edge_length)
-                breaks_data['Node_B'].append(break_node_id)
-                breaks_data['Latitude_B'].append(break_node_lat)
-                breaks_data['Longitude_B'].append(break_node_lon)
-                breaks_data['Break_Number'].append(break_traffic_number)
-    
-    return breaks_data
+    Args:
+        edges_flat: Edge IDs of all trips, flattened
+        offsets: Trip offsets into edges_flat
+        origin_distances: List of distances from origin to E-road
+        traffic_flows: List of traffic flows for each trip
+        lookups: Dictionary with lookup arrays
+        random_seed: Seed for random number generation (optional)
+    
+    Returns:
+        Dictionary with break data
+    """
+    return _collect_breaks(
+        edges_flat, offsets, origin_distances, traffic_flows, lookups,
+        driver=1, short_breaks_per_long=1, random_seed=random_seed
+    )
 
 
 def process_two_driver_breaks(
-    trip_edges_list: List[List[int]], 
+    edges_flat: np.ndarray,
+    offsets: np.ndarray,
     origin_distances: List[float],
     traffic_flows: List[float],
-    lookups: Dict[str, Dict],
+    lookups: Dict[str, np.ndarray],
     random_seed: int = None
-) -> Dict[str, List]:
+) -> Dict[str, np.ndarray]:
     """
     Process breaks for two-driver trips.
     
     Args:
-        trip_edges_list: List of edge ID lists for each trip
+        edges_flat: Edge IDs of all trips, flattened
+        offsets: Trip offsets into edges_flat
         origin_distances: List of distances from origin to E-road
         traffic_flows: List of traffic flows for each trip
-        lookups: Dictionary with lookup dictionaries
+        lookups: Dictionary with lookup arrays
         random_seed: Seed for random number generation (optional)
     
     Returns:
         Dictionary with break data
     """
-    if random_seed is not None:
-        np.random.seed(random_seed)
-    
-    trip_distance_threshold = BREAKS['DISTANCE_THRESHOLD']
-    random_range = BREAKS['RANDOM_RANGE']
-    short_breaks_before_long = BREAKS['TWO_DRIVER_SHORT_BREAKS_BEFORE_LONG']
-    
-    # Pre-allocate results
-    breaks_data = {
-        'Trip_ID': [],
-        'Driver': [],
-        'Break_Nr': [],
-        'Break_Type': [],
-        'Edge': [],
-        'Edge_length': [],
-        'Node_B': [],
-        'Latitude_B': [],
-        'Longitude_B': [],
-        'Break_Number': []
-    }
-    
-    # Process each trip
-    for trip_idx, edge_list in enumerate(trip_edges_list):
-        if not edge_list:
-            continue
-            
-        travel_distance = origin_distances[trip_idx]
-        breaks = 0
-        breaks_reset = 0  # Counts short breaks until next long break
-        
-        for edge_id in edge_list:
-            travel_distance += lookups['edge_length'].get(edge_id, 0)
-            
-            # Random threshold
-            threshold = trip_distance_threshold + np.random.randint(*random_range)
-            
-            if travel_distance > threshold:
-                travel_distance = 0
-                breaks += 1
-                
-                # Get break location data
-                break_edge_id = edge_id
-                break_edge_length = lookups['edge_length'].get(break_edge_id, 0)
-                break_node_id = lookups['edge_node_b'].get(edge_id, 0)
-                break_node_lat = lookups['node_lat'].get(break_node_id, 0)
-                break_node_lon = lookups['node_lon'].get(break_node_id, 0)
-                break_traffic_number = traffic_flows[trip_idx]
-                
-                # Determine break type
-                if breaks_reset <= short_breaks_before_long:
-                    break_type = 'short'
-                    breaks_reset += 1
-                else:
-                    break_type = 'long'
-                    breaks_reset = 0
-                
-                # Append to results
-                breaks_data['Trip_ID'].append(trip_idx)
-                breaks_data['Driver'].append(2)
-                breaks_data['Break_Nr'].append(breaks)
-                breaks_data['Break_Type'].append(break_type)
-                breaks_data['Edge'].append(break_edge_id)
-                breaks_data['Edge_length'].append(break_edge_length)
-                breaks_data['Node_B'].append(break_node_id)
-                breaks_data['Latitude_B'].append(break_node_lat)
-                breaks_data['Longitude_B'].append(break_node_lon)
-                breaks_data['Break_Number'].append(break_traffic_number)
-    
-    return breaks_data
+    # A long break follows once the short-break counter exceeds the limit
+    return _collect_breaks(
+        edges_flat, offsets, origin_distances, traffic_flows, lookups,
+        driver=2, short_breaks_per_long=BREAKS['TWO_DRIVER_SHORT_BREAKS_BEFORE_LONG'] + 1,
+        random_seed=random_seed
+    )
 
 
 def calculate_new_breaks(base_path=None, random_seed=42, export=True):
@@ -320,69 +461,70 @@ def calculate_new_breaks(base_path=None, random_seed=42, export=True):
     # 2. Filter traffic flows
     df_single_driver, df_two_driver = filter_traffic_flows(df_traffic_flow)
     
-    # 3. Parse edge strings to lists
-    single_driver_edges = [
-        parse_edge_string(s) for s in df_single_driver['Edge_path_E_road'].tolist()
-    ]
-    
-    two_driver_edges = [
-        parse_edge_string(s) for s in df_two_driver['Edge_path_E_road'].tolist()
-    ]
+    # 3. Parse edge strings into one flattened edge array per cohort
+    single_driver_edges, single_driver_offsets = parse_edge_column(df_single_driver['Edge_path_E_road'])
+    two_driver_edges, two_driver_offsets = parse_edge_column(df_two_driver['Edge_path_E_road'])
     
-    # 4. Create lookup dictionaries
-    lookups = create_lookup_dictionaries(df_edges, df_nodes)
+    # 4. Create lookup arrays
+    lookups = create_lookup_arrays(df_edges, df_nodes)
     
-    # 5. Get lists of origin distances and traffic flows
+    # 5. Get arrays of origin distances and traffic flows
     # Use dynamic column name based on configuration
     traffic_flow_column = get_traffic_flow_column()
     
-    single_driver_origin_distances = df_single_driver['Distance_from_origin_region_to_E_road'].tolist()
-    single_driver_traffic_flows = df_single_driver[traffic_flow_column].tolist()
-    
-    two_driver_origin_distances = df_two_driver['Distance_from_origin_region_to_E_road'].tolist()
-    two_driver_traffic_flows = df_two_driver[traffic_flow_column].tolist()
-    
-    # 6. Process breaks
-    logger.info("Processing single-driver breaks...")
-    single_driver_breaks = process_single_driver_breaks(
+    single_driver_args = (
         single_driver_edges,
-        single_driver_origin_distances,
-        single_driver_traffic_flows,
+        single_driver_offsets,
+        df_single_driver['Distance_from_origin_region_to_E_road'].to_numpy(),
+        df_single_driver[traffic_flow_column].to_numpy(),
         lookups,
         random_seed
     )
-    
-    logger.info("Processing two-driver breaks...")
-    two_driver_breaks = process_two_driver_breaks(
+    two_driver_args = (
         two_driver_edges,
-        two_driver_origin_distances,
-        two_driver_traffic_flows,
+        two_driver_offsets,
+        df_two_driver['Distance_from_origin_region_to_E_road'].to_numpy(),
+        df_two_driver[traffic_flow_column].to_numpy(),
         lookups,
         random_seed
     )
     
-    # 7. Combine results
-    all_breaks = {k: single_driver_breaks[k] + two_driver_breaks[k] for k in single_driver_breaks.keys()}
-    df_breaks = pd.DataFrame(all_breaks)
-    
-    # 8. Sort and reset index
-    df_breaks.sort_values(by=['Trip_ID', 'Break_Nr'], inplace=True)
-    df_breaks.reset_index(drop=True, inplace=True)
+    # 6. Process breaks; the cohorts are independent and each seeds its own walk
+    if len(single_driver_edges) + len(two_driver_edges) >= PARALLEL_MIN_EDGES:
+        logger.info("Processing single-driver and two-driver breaks in parallel...")
+        # Spawn fresh workers: this runs next to other loader threads, and from
+        # the UI inside the web server process, where forking could copy locks
+        # held by other threads and deadlock the workers
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+            single_driver_future = executor.submit(process_single_driver_breaks, *single_driver_args)
+            two_driver_future = executor.submit(process_two_driver_breaks, *two_driver_args)
+            single_driver_breaks = single_driver_future.result()
+            two_driver_breaks = two_driver_future.result()
+    else:
+        logger.info("Processing single-driver breaks...")
+        single_driver_breaks = process_single_driver_breaks(*single_driver_args)
+        
+        logger.info("Processing two-driver breaks...")
+        two_driver_breaks = process_two_driver_breaks(*two_driver_args)
     
-    # 9. Generate unique Break_ID and select final columns
-    df_breaks['Break_ID'] = df_breaks.index
+    # 7. Combine results
+    df_breaks = pd.concat(
+        [pd.DataFrame(single_driver_breaks), pd.DataFrame(two_driver_breaks)], ignore_index=True
+    )
+    df_breaks['Break_Type'] = pd.Categorical.from_codes(df_breaks['Break_Type'].to_numpy(), categories=BREAK_TYPES)
     
-    # Select and rearrange columns for final output
-    final_columns = [
-        'Break_ID', 'Latitude_B', 'Longitude_B', 'Break_Type', 'Break_Number'
-    ]
+    # 8. Order by trip and break number; a stable sort keeps single-driver
+    # breaks first where trip numbers of the two cohorts coincide
+    order = np.lexsort((df_breaks['Break_Nr'].to_numpy(), df_breaks['Trip_ID'].to_numpy()))
     
-    result_df = df_breaks[final_columns].copy()
+    # 9. Select the final columns in that order and number the breaks
+    result_df = df_breaks[['Latitude_B', 'Longitude_B', 'Break_Type', 'Break_Number']].take(order)
+    result_df.index = pd.RangeIndex(len(result_df))
+    result_df.insert(0, 'Break_ID', np.arange(len(result_df), dtype=np.int64))
     
     # 10. Export results if required
     if export:
         output_path = FILES['BREAKS_OUTPUT']
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
         # Save as JSON with structured format - changed BASE_YEAR to year
         metadata = {
@@ -392,10 +534,17 @@ def calculate_new_breaks(base_path=None, random_seed=42, export=True):
         }
         dataframe_to_json(result_df, output_path, metadata=metadata, structure_type='breaks')
         logger.info(f"Results exported to: {output_path}")
+        
+        # Columnar copy for fast reloading; written after the JSON so that it
+        # is only used while it is at least as new
+        if PYARROW_AVAILABLE:
+            result_df.to_parquet(FILES['BREAKS_PARQUET'], engine='pyarrow', compression='snappy', index=False)
+            logger.info(f"Results exported to: {FILES['BREAKS_PARQUET']}")
     
     # Log summary statistics
-    short_breaks_count = len(df_breaks[df_breaks['Break_Type'] == 'short'])
-    long_breaks_count = len(df_breaks[df_breaks['Break_Type'] == 'long'])
+    short_breaks_count, long_breaks_count = np.bincount(
+        df_breaks['Break_Type'].cat.codes.to_numpy(), minlength=len(BREAK_TYPES)
+    ).tolist()
     logger.info(f"Generated {short_breaks_count} short breaks and {long_breaks_count} long breaks")
     
     time_end = time.time()
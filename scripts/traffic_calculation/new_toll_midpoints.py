@@ -9,6 +9,18 @@ import pandas as pd
 import datetime
 from pathlib import Path
 from json_utils import dataframe_to_json, json_to_dataframe
+from toll_matching import standardize_coordinates, text_columns
+
+# pyarrow is optional; its multithreaded CSV reader is opt-in via FAST_IO=1
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+FAST_IO = os.environ.get('FAST_IO') == '1' and PYARROW_AVAILABLE
+
+# Section start and end coordinates of the toll table
+COORD_COLUMNS = ['Länge Von', 'Länge Nach', 'Breite Von', 'Breite Nach']
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -29,18 +41,21 @@ def process_toll_midpoints(maut_file_path, output_path, skiprows=1):
     
     # Load the raw toll section data
     if maut_file_path.endswith('.xlsx') or maut_file_path.endswith('.xls'):
-        df_mauttabelle = pd.read_excel(maut_file_path, skiprows=skiprows)
+        # Coordinates stored as text use a decimal comma
+        df_mauttabelle = pd.read_excel(maut_file_path, skiprows=skiprows, decimal=',')
     else:
-        df_mauttabelle = pd.read_csv(maut_file_path, skiprows=skiprows)
+        df_mauttabelle = pd.read_csv(maut_file_path, skiprows=skiprows, engine='pyarrow' if FAST_IO else 'c')
     
-    # Create a deep copy to avoid SettingWithCopyWarning
-    df_mauttabelle = df_mauttabelle.copy(deep=True)
+    # The CSV form is comma-separated, so a decimal comma can only be fixed after reading
+    text_coord_cols = text_columns(df_mauttabelle, COORD_COLUMNS)
+    if text_coord_cols:
+        df_mauttabelle = standardize_coordinates(df_mauttabelle, text_coord_cols, inplace=True)
     
     # Process the data
     logger.info("Cleaning and calculating midpoints for toll sections")
-    df_mauttabelle.loc[:, 'Bundesfernstraße'] = df_mauttabelle['Bundesfernstraße'].str.strip()
-    df_mauttabelle.loc[:, 'midpoint_laenge'] = (df_mauttabelle['Länge Von'] + df_mauttabelle['Länge Nach']) / 2
-    df_mauttabelle.loc[:, 'midpoint_breite'] = (df_mauttabelle['Breite Von'] + df_mauttabelle['Breite Nach']) / 2
+    df_mauttabelle['Bundesfernstraße'] = df_mauttabelle['Bundesfernstraße'].str.strip()
+    df_mauttabelle['midpoint_laenge'] = (df_mauttabelle['Länge Von'] + df_mauttabelle['Länge Nach']) / 2
+    df_mauttabelle['midpoint_breite'] = (df_mauttabelle['Breite Von'] + df_mauttabelle['Breite Nach']) / 2
     
     # Save processed data as structured JSON
     metadata = {
@@ -3,15 +3,24 @@ Functions for matching toll sections to locations, calculating distances,
 and determining daily demand distributions.
 """
 
+import os
 import pandas as pd
 import numpy as np
 import logging
+import weakref
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 from config_demand import DAY_MAPPING, GERMAN_DAYS, TIME, year, get_charging_column, validate_year
 from json_utils import dataframe_to_json, clean_json_structure
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the number of entries in one block of the distance matrix
+MAX_DISTANCE_MATRIX_ELEMENTS = 1 << 22
+
+# Half height in degrees of the box searched first around a single location
+NEAREST_BOX_DEGREES = 2.0
+
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
     Calculate the Haversine distance (in km) between two points.
@@ -24,88 +33,322 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     r = 6371  # Earth's radius in km
     return c * r
 
-def standardize_coordinates(df, coord_columns):
+def haversine_terms_rad(lat, lon, lats_rad, lons_rad, cos_lats=None):
+    """
+    Calculate the haversine term a = sin²(Δφ/2) + cos φ1 cos φ2 sin²(Δλ/2).
+    
+    The distance 2r·arcsin(√a) grows with a, so nearest-point searches can
+    compare these terms and skip the arcsin and square root for all but the
+    winning points. Arguments broadcast as in haversine_distances_rad.
+    
+    Args:
+        lat: Latitude of the query point(s) in degrees
+        lon: Longitude of the query point(s) in degrees
+        lats_rad: Array of target latitudes in radians
+        lons_rad: Array of target longitudes in radians
+        cos_lats: Precomputed np.cos(lats_rad), for targets that are searched
+            repeatedly (optional)
+    
+    Returns:
+        Array of haversine terms
+    """
+    if cos_lats is None:
+        cos_lats = np.cos(lats_rad)
+    lat, lon = np.radians(lat), np.radians(lon)
+    dlon = lons_rad - lon
+    dlat = lats_rad - lat
+    return np.sin(dlat/2)**2 + np.cos(lat)*cos_lats*np.sin(dlon/2)**2
+
+def haversine_distances_rad(lat, lon, lats_rad, lons_rad):
+    """
+    Calculate the Haversine distances (in km) from query points to many points.
+    
+    The arguments broadcast against each other, so passing column vectors
+    of query points yields a full distance matrix.
+    
+    Args:
+        lat: Latitude of the query point(s) in degrees
+        lon: Longitude of the query point(s) in degrees
+        lats_rad: Array of target latitudes in radians
+        lons_rad: Array of target longitudes in radians
+    
+    Returns:
+        Array of distances in km
+    """
+    a = haversine_terms_rad(lat, lon, lats_rad, lons_rad)
+    c = 2 * np.arcsin(np.sqrt(a))
+    r = 6371  # Earth's radius in km
+    return c * r
+
+def standardize_coordinates(df, coord_columns, inplace=False):
     """
     Standardize coordinate columns to numeric values.
     
     Args:
         df: DataFrame containing coordinate columns
         coord_columns: List of column names containing coordinates
+        inplace: Replace the columns in df itself instead of a shallow copy
         
     Returns:
         DataFrame with standardized coordinate values
     """
-    df = df.copy(deep=True)
+    if not inplace:
+        # Columns are replaced, never written into, so a shallow copy suffices
+        df = df.copy(deep=False)
     
     for col in coord_columns:
         if col not in df.columns:
             logger.warning(f"Column {col} not found in DataFrame")
             continue
-            
-        if df[col].dtype == 'object':
+        
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            # Already parsed, nothing to convert
+            continue
+        if pd.api.types.is_string_dtype(values.dtype):
             # Replace comma with period for decimal separator
-            df.loc[:, col] = df[col].str.replace(',', '.', regex=False)
+            values = values.str.replace(',', '.', regex=False)
         
         # Convert to numeric, coercing errors to NaN
-        df.loc[:, col] = pd.to_numeric(df[col], errors='coerce')
+        df[col] = pd.to_numeric(values, errors='coerce')
     
     return df
 
-def find_nearest_traffic_point(lat, lon, df_mauttabelle, df_befahrung):
+def autobahn_mask(highways):
     """
-    Find the nearest traffic measurement point for a given location.
+    Mark the Autobahn sections among the toll sections.
+    
+    Any road name containing a 'B' is a Bundesstraße. The names are not
+    stripped yet, so a leading-character test would miss padded names.
+    
+    Args:
+        highways: Series with the Bundesfernstraße names
+    
+    Returns:
+        Boolean numpy array, True for Autobahn sections and missing names
+    """
+    return ~highways.str.contains('B', regex=False, na=False).to_numpy(dtype=bool)
+
+# Prepared toll tables by id(), dropped when the table is garbage collected
+_PREPARED_MAUT_TABLES = {}
+_PREPARED_TOLL_SECTIONS = {}
+_PREPARED_TRAFFIC_TABLES = {}
+
+def _cached_per_table(cache, table, build):
+    """
+    Return build(table), computed once for the lifetime of the table.
+    
+    Args:
+        cache: Dict holding the prepared results by id() of the table
+        table: DataFrame that is treated as read-only
+        build: Function preparing the result from the table
+    
+    Returns:
+        The cached or newly built result
     """
-    # Make a copy to avoid SettingWithCopyWarning
-    df_mauttabelle = df_mauttabelle.copy(deep=True)
+    key = id(table)
+    cached = cache.get(key)
+    if cached is not None and cached[0]() is table:
+        return cached[1]
     
+    prepared = build(table)
+    cache[key] = (weakref.ref(table), prepared)
+    weakref.finalize(table, cache.pop, key, None)
+    return prepared
+
+def _prepare_maut_table(df_mauttabelle):
+    """
+    Prepare the toll table for nearest-section searches, once per table.
+    
+    Keeps only Autobahn sections and converts their midpoints to radians.
+    
+    Args:
+        df_mauttabelle: DataFrame with toll section data
+    
+    Returns:
+        Tuple of (section_ids, highways, mid_lat_rad, mid_lon_rad, cos_mid_lat);
+        section_ids and highways are None if the table has no such column
+    """
+    return _cached_per_table(_PREPARED_MAUT_TABLES, df_mauttabelle, _build_maut_arrays)
+
+def _build_maut_arrays(table):
+    """Build the search arrays returned by _prepare_maut_table."""
     # Filter to only include Autobahn sections (not B-roads) if column exists
-    if 'Bundesfernstraße' in df_mauttabelle.columns:
-        df_mauttabelle = df_mauttabelle[~df_mauttabelle['Bundesfernstraße'].str.contains('B')]
+    if 'Bundesfernstraße' in table.columns:
+        table = table[autobahn_mask(table['Bundesfernstraße'])]
     else:
         logger.warning("Column 'Bundesfernstraße' not found. Using all toll sections.")
     
     # Check for coordinate columns
-    if all(col in df_mauttabelle.columns for col in ['midpoint_breite', 'midpoint_laenge']):
+    if all(col in table.columns for col in ['midpoint_breite', 'midpoint_laenge']):
         # Use pre-calculated midpoints
-        df_mauttabelle.loc[:, 'distance'] = df_mauttabelle.apply(
-            lambda row: haversine_distance(lat, lon, row['midpoint_breite'], row['midpoint_laenge']),
-            axis=1
-        )
-    elif all(col in df_mauttabelle.columns for col in ['Breite Von', 'Länge Von', 'Breite Nach', 'Länge Nach']):
-        # Standardize coordinates
+        mid_lat = table['midpoint_breite'].to_numpy(dtype=float)
+        mid_lon = table['midpoint_laenge'].to_numpy(dtype=float)
+    elif all(col in table.columns for col in ['Breite Von', 'Länge Von', 'Breite Nach', 'Länge Nach']):
+        # Standardize text coordinates and calculate midpoints on the fly
         coord_cols = ['Breite Von', 'Länge Von', 'Breite Nach', 'Länge Nach']
-        df_mauttabelle = standardize_coordinates(df_mauttabelle, coord_cols)
-        
-        # Calculate midpoints on the fly
-        df_mauttabelle.loc[:, 'mid_lat'] = (df_mauttabelle['Breite Von'] + df_mauttabelle['Breite Nach']) / 2
-        df_mauttabelle.loc[:, 'mid_lon'] = (df_mauttabelle['Länge Von'] + df_mauttabelle['Länge Nach']) / 2
-        
-        df_mauttabelle.loc[:, 'distance'] = df_mauttabelle.apply(
-            lambda row: haversine_distance(lat, lon, row['mid_lat'], row['mid_lon']),
-            axis=1
-        )
+        coords = table[coord_cols]
+        text_coord_cols = text_columns(coords, coord_cols)
+        if text_coord_cols:
+            coords = standardize_coordinates(coords, text_coord_cols)
+        mid_lat = ((coords['Breite Von'] + coords['Breite Nach']) / 2).to_numpy(dtype=float)
+        mid_lon = ((coords['Länge Von'] + coords['Länge Nach']) / 2).to_numpy(dtype=float)
     else:
         raise ValueError("Missing required coordinate columns in toll section data")
     
-    closest_row = df_mauttabelle.loc[df_mauttabelle['distance'].idxmin()]
-    section_id = int(closest_row['Abschnitts-ID']) if 'Abschnitts-ID' in closest_row else -1
-    highway = closest_row.get('Bundesfernstraße', "Unknown")
+    mid_lat_rad = np.radians(mid_lat)
+    return (
+        table['Abschnitts-ID'].to_numpy() if 'Abschnitts-ID' in table.columns else None,
+        table['Bundesfernstraße'].to_numpy() if 'Bundesfernstraße' in table.columns else None,
+        mid_lat_rad,
+        np.radians(mid_lon),
+        np.cos(mid_lat_rad)
+    )
+
+def text_columns(df, columns):
+    """Return the columns of df that are not numeric and still need parsing."""
+    return [col for col in columns if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])]
+
+def _nearest_in_box(lat, lon, mid_lat_rad, mid_lon_rad, cos_mid_lat):
+    """
+    Search the nearest midpoint among those in a box around one location.
+    
+    The box spans NEAREST_BOX_DEGREES of latitude and the same width in
+    kilometres of longitude. Its winner is only accepted if it is closer than
+    any point outside the box can be, so the result equals a full search.
+    
+    Args:
+        lat: Latitude of the location in degrees
+        lon: Longitude of the location in degrees
+        mid_lat_rad: Array of midpoint latitudes in radians
+        mid_lon_rad: Array of midpoint longitudes in radians
+        cos_mid_lat: np.cos(mid_lat_rad)
+    
+    Returns:
+        Position of the nearest midpoint, or None if the full search is needed
+    """
+    lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+    half_lat = np.radians(NEAREST_BOX_DEGREES)
+    half_lon = min(half_lat / max(0.1, np.cos(lat_rad)), np.pi / 2)
+    
+    # Longitude differences wrapped to [-pi, pi)
+    dlon = np.remainder(mid_lon_rad - lon_rad + np.pi, 2 * np.pi) - np.pi
+    in_box = np.flatnonzero((np.abs(mid_lat_rad - lat_rad) < half_lat) & (np.abs(dlon) < half_lon))
+    if len(in_box) == 0:
+        return None
+    
+    terms = haversine_terms_rad(lat, lon, mid_lat_rad[in_box], mid_lon_rad[in_box], cos_mid_lat[in_box])
+    best = np.argmin(terms)
+    
+    # Angular distance from the location to the nearest edge of the box
+    inner = min(half_lat, np.arcsin(min(1.0, np.cos(lat_rad) * np.sin(half_lon))))
+    if terms[best] < np.sin(inner / 2) ** 2:
+        return in_box[best]
+    return None
+
+def find_nearest_traffic_point(lat, lon, df_mauttabelle, df_befahrung):
+    """
+    Find the nearest traffic measurement point for a given location.
+    """
+    section_ids, highways, mid_lat_rad, mid_lon_rad, cos_mid_lat = _prepare_maut_table(df_mauttabelle)
+    
+    closest = _nearest_in_box(lat, lon, mid_lat_rad, mid_lon_rad, cos_mid_lat)
+    if closest is None:
+        closest = np.nanargmin(haversine_terms_rad(lat, lon, mid_lat_rad, mid_lon_rad, cos_mid_lat))
+    distance = haversine_distances_rad(lat, lon, mid_lat_rad[closest], mid_lon_rad[closest])
+    section_id = int(section_ids[closest]) if section_ids is not None else -1
+    highway = highways[closest] if highways is not None else "Unknown"
     
-    logger.info(f"Nearest traffic point ID: {section_id} on {highway} at distance {closest_row['distance']:.2f} km")
+    logger.info(f"Nearest traffic point ID: {section_id} on {highway} at distance {distance:.2f} km")
     
     return section_id
 
-def toll_section_matching_and_daily_demand(results_df, df_mauttabelle, df_befahrung):
+def nearest_midpoints(query_coords, mid_lat_rad, mid_lon_rad):
     """
-    Match toll sections to locations and calculate normalized daily demand.
+    Find the nearest toll section midpoint for every query point.
+    
+    Small inputs use the full haversine distance matrix. When that matrix
+    would exceed MAX_DISTANCE_MATRIX_ELEMENTS, a BallTree with the haversine
+    metric finds the nearest midpoints in O(log M) per query instead. Either
+    way, distances are only computed for the nearest midpoints.
+    
+    Args:
+        query_coords: (N, 2) array of query latitudes and longitudes in degrees
+        mid_lat_rad: Array of midpoint latitudes in radians
+        mid_lon_rad: Array of midpoint longitudes in radians
+    
+    Returns:
+        Tuple of (positions, distances) with the position of the nearest
+        midpoint and its distance in km for every query point
+    """
+    if len(query_coords) * len(mid_lat_rad) > MAX_DISTANCE_MATRIX_ELEMENTS:
+        try:
+            from sklearn.neighbors import BallTree
+        except ImportError:
+            BallTree = None
+        if BallTree is not None:
+            # The tree cannot hold NaN coordinates; those midpoints never match
+            valid_positions = np.flatnonzero(~(np.isnan(mid_lat_rad) | np.isnan(mid_lon_rad)))
+            tree = BallTree(np.column_stack([mid_lat_rad[valid_positions], mid_lon_rad[valid_positions]]),
+                            metric='haversine')
+            _, nearest = tree.query(np.radians(query_coords), k=1)
+            positions = valid_positions[nearest[:, 0]]
+            distances = haversine_distances_rad(query_coords[:, 0], query_coords[:, 1],
+                                                mid_lat_rad[positions], mid_lon_rad[positions])
+            return positions, distances
+    
+    # Matrix of haversine terms between query rows and midpoints, computed in
+    # row blocks so that its size stays bounded for large inputs; only the
+    # nearest midpoint of each row is converted to a distance
+    closest_positions = np.empty(len(query_coords), dtype=np.intp)
+    block_size = max(1, MAX_DISTANCE_MATRIX_ELEMENTS // max(1, len(mid_lat_rad)))
+    
+    # The terms are ranked in float32, which halves the memory traffic of the
+    # matrix. Its resolution of about a metre only matters for near ties; the
+    # returned distances are computed in float64.
+    query32 = query_coords.astype(np.float32)
+    mid_lat32 = mid_lat_rad.astype(np.float32)[None, :]
+    mid_lon32 = mid_lon_rad.astype(np.float32)[None, :]
+    cos_mid_lat32 = np.cos(mid_lat32)
+    
+    def nearest_in_block(start):
+        block = query32[start:start + block_size]
+        terms = haversine_terms_rad(block[:, 0:1], block[:, 1:2], mid_lat32, mid_lon32, cos_mid_lat32)
+        closest_positions[start:start + len(block)] = np.nanargmin(terms, axis=1)
+    
+    starts = range(0, len(query_coords), block_size)
+    if len(starts) > 1:
+        # numpy releases the GIL inside its ufuncs, so blocks run in parallel threads
+        with ThreadPoolExecutor(max_workers=min(len(starts), os.cpu_count() or 1)) as executor:
+            list(executor.map(nearest_in_block, starts))
+    else:
+        for start in starts:
+            nearest_in_block(start)
+    min_distances = haversine_distances_rad(query_coords[:, 0], query_coords[:, 1],
+                                            mid_lat_rad[closest_positions], mid_lon_rad[closest_positions])
+    return closest_positions, min_distances
+
+def _build_toll_sections(df_mauttabelle):
+    """
+    Clean the toll table for toll_section_matching_and_daily_demand.
+    
+    Keeps only Autobahn sections, parses the coordinates and adds the
+    midpoint columns.
+    
+    Args:
+        df_mauttabelle: DataFrame with toll section data
+    
+    Returns:
+        Tuple of (toll sections with the midpoint_breite and midpoint_laenge
+        columns, midpoint latitudes in radians, midpoint longitudes in radians)
     """
-    # Make a deep copy to avoid SettingWithCopyWarning
-    df_mauttabelle = df_mauttabelle.copy(deep=True)
+    # Shallow copy so that the columns added below never reach the caller's table
+    df_mauttabelle = df_mauttabelle.copy(deep=False)
     
     # Data cleaning - check if column exists before filtering
     if 'Bundesfernstraße' in df_mauttabelle.columns:
-        df_mauttabelle = df_mauttabelle[~df_mauttabelle['Bundesfernstraße'].str.contains('B')]
-        df_mauttabelle.loc[:, 'Bundesfernstraße'] = df_mauttabelle['Bundesfernstraße'].str.strip()
+        df_mauttabelle = df_mauttabelle[autobahn_mask(df_mauttabelle['Bundesfernstraße'])]
+        df_mauttabelle['Bundesfernstraße'] = df_mauttabelle['Bundesfernstraße'].str.strip()
     else:
         logger.warning("Column 'Bundesfernstraße' not found in toll section data. Proceeding without filtering.")
     
@@ -121,117 +364,172 @@ def toll_section_matching_and_daily_demand(results_df, df_mauttabelle, df_befahr
         else:
             raise ValueError("Neither coordinate columns nor midpoint columns found in toll section data")
     else:
-        df_mauttabelle = standardize_coordinates(df_mauttabelle, available_coord_cols)
+        # Coordinates are normally parsed at read time; only text columns need converting
+        text_coord_cols = text_columns(df_mauttabelle, available_coord_cols)
+        if text_coord_cols:
+            df_mauttabelle = standardize_coordinates(df_mauttabelle, text_coord_cols, inplace=True)
     
     # Pre-calculate midpoints for toll sections if they don't exist already
     if 'midpoint_laenge' not in df_mauttabelle.columns and all(col in df_mauttabelle.columns for col in ['Länge Von', 'Länge Nach']):
-        df_mauttabelle.loc[:, 'midpoint_laenge'] = (df_mauttabelle['Länge Von'] + df_mauttabelle['Länge Nach']) / 2
+        df_mauttabelle['midpoint_laenge'] = (df_mauttabelle['Länge Von'] + df_mauttabelle['Länge Nach']) / 2
         
     if 'midpoint_breite' not in df_mauttabelle.columns and all(col in df_mauttabelle.columns for col in ['Breite Von', 'Breite Nach']):
-        df_mauttabelle.loc[:, 'midpoint_breite'] = (df_mauttabelle['Breite Von'] + df_mauttabelle['Breite Nach']) / 2
+        df_mauttabelle['midpoint_breite'] = (df_mauttabelle['Breite Von'] + df_mauttabelle['Breite Nach']) / 2
     
     # Make sure we have midpoints
     if 'midpoint_laenge' not in df_mauttabelle.columns or 'midpoint_breite' not in df_mauttabelle.columns:
         raise ValueError("Could not create or find midpoint coordinates")
     
-    # Join with traffic data
-    weekdays = GERMAN_DAYS
-    traffic_mapping = df_befahrung.set_index('Strecken-ID')
-    df_mauttabelle = df_mauttabelle.join(traffic_mapping[weekdays], on='Abschnitts-ID', how='left')
+    # Convert the midpoints once instead of per query row
+    mid_lat_rad = np.radians(df_mauttabelle['midpoint_breite'].to_numpy(dtype=float))
+    mid_lon_rad = np.radians(df_mauttabelle['midpoint_laenge'].to_numpy(dtype=float))
+    
+    return df_mauttabelle, mid_lat_rad, mid_lon_rad
 
-    min_distances = []
-    def find_closest_row(ausschreibung_row):
-        laengengrad = ausschreibung_row['Laengengrad']
-        breitengrad = ausschreibung_row['Breitengrad']
-        
-        # Check for missing coordinates
-        if pd.isna(laengengrad) or pd.isna(breitengrad):
-            logger.warning(f"Missing coordinates for row {ausschreibung_row.name}")
-            return pd.Series(index=df_mauttabelle.columns)
-        
-        # Calculate Haversine distance instead of Euclidean distance
-        df_mauttabelle['distance'] = df_mauttabelle.apply(
-            lambda row: haversine_distance(breitengrad, laengengrad, row['midpoint_breite'], row['midpoint_laenge']),
-            axis=1
-        )
-        
-        min_idx = df_mauttabelle['distance'].idxmin()
-        min_distances.append(df_mauttabelle.loc[min_idx, 'distance'])
-        return df_mauttabelle.loc[min_idx]
-        
-    closest_rows = results_df.apply(find_closest_row, axis=1)
+def toll_section_matching_and_daily_demand(results_df, df_mauttabelle, df_befahrung):
+    """
+    Match toll sections to locations and calculate normalized daily demand.
+    """
+    df_mauttabelle, mid_lat_rad, mid_lon_rad = _cached_per_table(
+        _PREPARED_TOLL_SECTIONS, df_mauttabelle, _build_toll_sections)
+    
+    query_coords = results_df[['Breitengrad', 'Laengengrad']].to_numpy(dtype=float)
+    has_coords = ~np.isnan(query_coords).any(axis=1)
+    for label in results_df.index[~has_coords]:
+        logger.warning(f"Missing coordinates for row {label}")
+    query_coords = query_coords[has_coords]
+    
+    closest_positions, min_distances = nearest_midpoints(query_coords, mid_lat_rad, mid_lon_rad)
+    found_labels = results_df.index[has_coords]
+    
+    # Join the traffic data onto the matched sections only; the first row of a
+    # repeated Strecken-ID wins, as in a join on the whole toll table
+    weekdays = GERMAN_DAYS
+    traffic_mapping = df_befahrung.set_index('Strecken-ID')[weekdays]
+    if not traffic_mapping.index.is_unique:
+        traffic_mapping = traffic_mapping[~traffic_mapping.index.duplicated()]
+    closest_rows = df_mauttabelle.iloc[closest_positions].join(traffic_mapping, on='Abschnitts-ID', how='left')
+    closest_rows['distance'] = min_distances
+    
+    # Rows without coordinates get an all-NaN toll section row; concat and
+    # reindex share the column data under copy-on-write
+    closest_rows.index = found_labels
+    closest_rows = closest_rows.reindex(results_df.index)
     results_df = pd.concat([results_df, closest_rows], axis=1)
-
-    # Create a copy of results_df to avoid warnings
-    results_df = results_df.copy(deep=True)
     
     # Ensure the forecast year is valid
     try:
         current_year = validate_year(year)
         logger.info(f"Calculating daily demand using {current_year} projections")
         
-        weekly_totals = results_df[weekdays].sum(axis=1)
-        for day in weekdays:
-            # Handle division by zero
-            results_df.loc[:, day] = results_df[day].div(weekly_totals, fill_value=0)
-            
-            # Use the dynamic column name function
-            hpc_col = get_charging_column('HPC', current_year)
-            ncs_col = get_charging_column('NCS', current_year)
-            
-            results_df.loc[:, f'{day}_HPC'] = (results_df[day] * results_df[hpc_col] / TIME['WEEKS_PER_YEAR']).round()
-            results_df.loc[:, f'{day}_NCS'] = (results_df[day] * results_df[ncs_col] / TIME['WEEKS_PER_YEAR']).round()
+        hpc_col = get_charging_column('HPC', current_year)
+        ncs_col = get_charging_column('NCS', current_year)
+        
+        # Normalize all weekdays at once on the (rows, 7) count matrix; a
+        # missing count counts as 0 and a zero week yields NaN/inf as before
+        counts = results_df[weekdays].to_numpy(dtype=np.float64)
+        weekly_totals = np.nansum(counts, axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.nan_to_num(counts, nan=0.0) / weekly_totals
+        
+        hpc = results_df[hpc_col].to_numpy(dtype=np.float64)[:, None]
+        ncs = results_df[ncs_col].to_numpy(dtype=np.float64)[:, None]
+        daily_hpc = np.round(shares * hpc / TIME['WEEKS_PER_YEAR'])
+        daily_ncs = np.round(shares * ncs / TIME['WEEKS_PER_YEAR'])
+        
+        daily_columns = {}
+        for i, day in enumerate(weekdays):
+            daily_columns[day] = shares[:, i]
+            daily_columns[f'{day}_HPC'] = daily_hpc[:, i]
+            daily_columns[f'{day}_NCS'] = daily_ncs[:, i]
+        results_df = results_df.assign(**daily_columns)
     except ValueError as e:
         logger.error(f"Error in year validation: {e}")
         raise
     
     return results_df
 
+def _build_traffic_lookup(df_befahrung):
+    """
+    Index the weekday traffic counts by Strecken-ID.
+    
+    Args:
+        df_befahrung: DataFrame with traffic counts per Strecken-ID
+    
+    Returns:
+        Tuple of (dict from Strecken-ID to the row of its first occurrence,
+        (rows, 7) float array of the weekday counts)
+    """
+    ids = df_befahrung['Strecken-ID'].to_numpy()
+    first = ~pd.Index(ids).duplicated()
+    positions = dict(zip(ids[first].tolist(), np.flatnonzero(first).tolist()))
+    return positions, df_befahrung[GERMAN_DAYS].to_numpy(dtype=np.float64)
+
+def weekday_traffic(reference_point_id, df_befahrung):
+    """
+    Look up the weekday traffic counts of one reference point.
+    
+    Args:
+        reference_point_id: Strecken-ID of the reference point
+        df_befahrung: DataFrame with traffic counts per Strecken-ID
+    
+    Returns:
+        Array of the 7 weekday counts in GERMAN_DAYS order
+    """
+    positions, counts = _cached_per_table(_PREPARED_TRAFFIC_TABLES, df_befahrung, _build_traffic_lookup)
+    position = positions.get(reference_point_id)
+    if position is None:
+        raise ValueError(f"Reference point ID {reference_point_id} not found")
+    return counts[position]
+
 def scale_charging_demand(reference_point_id, df_befahrung):
     """
     Scale charging demand for a single reference point based on traffic patterns.
     """
-    reference_data = df_befahrung[df_befahrung['Strecken-ID'] == reference_point_id]
-    if reference_data.empty:
-        raise ValueError(f"Reference point ID {reference_point_id} not found")
-        
-    traffic_data = reference_data.iloc[0]
-    total_traffic = sum(traffic_data[day] for day in GERMAN_DAYS)
+    weekly_counts = weekday_traffic(reference_point_id, df_befahrung)
+    total_traffic = weekly_counts.sum()
     if total_traffic == 0:
         logger.warning("No traffic data found, using equal distribution")
-        scaling_factors = {day: 0 for day in GERMAN_DAYS}
+        scaling_factors = np.zeros(len(GERMAN_DAYS), dtype=int)
     else:
-        scaling_factors = {day: traffic_data[day] / total_traffic for day in GERMAN_DAYS}
+        scaling_factors = weekly_counts / total_traffic
     result = pd.DataFrame({
         'Weekday': [DAY_MAPPING[day] for day in GERMAN_DAYS],
-        'ScalingFactor': [scaling_factors[day] for day in GERMAN_DAYS]
+        'ScalingFactor': scaling_factors
     })
     result.set_index('Weekday', inplace=True)
     return result
 
+def _scale_weekdays(weekly_counts, annual_hpc, annual_ncs):
+    """
+    Distribute annual HPC and NCS sessions over the weekdays of one week.
+    
+    Args:
+        weekly_counts: Array of the 7 weekday traffic counts
+        annual_hpc: Annual HPC sessions
+        annual_ncs: Annual NCS sessions
+    
+    Returns:
+        (7, 2) float array of rounded HPC and NCS sessions per weekday
+    """
+    total = weekly_counts.sum()
+    scales = weekly_counts / total if total != 0 else np.zeros_like(weekly_counts)
+    annual = np.array([annual_hpc, annual_ncs], dtype=np.float64)
+    return np.round(scales[:, None] * annual / TIME['WEEKS_PER_YEAR'])
+
 def scale_charging_sessions(reference_point_id, annual_hpc_sessions, annual_ncs_sessions, df_befahrung):
     """
     Calculate weekly charging sessions for HPC and NCS based on annual targets.
     """
-    reference_data = df_befahrung[df_befahrung['Strecken-ID'] == reference_point_id]
-    if reference_data.empty:
-        raise ValueError(f"Reference point ID {reference_point_id} not found")
-        
-    traffic_data = reference_data.iloc[0]
-    total_traffic = sum(traffic_data[day] for day in GERMAN_DAYS)
-    if total_traffic == 0:
+    weekly_counts = weekday_traffic(reference_point_id, df_befahrung)
+    if weekly_counts.sum() == 0:
         logger.warning("No traffic data found, using equal distribution")
-        scaling_factors = {day: 0 for day in GERMAN_DAYS}
-    else:
-        scaling_factors = {day: traffic_data[day] / total_traffic for day in GERMAN_DAYS}
     
-    result = pd.DataFrame(index=list(DAY_MAPPING.values()))
-    for german_day, english_day in DAY_MAPPING.items():
-        scale = scaling_factors[german_day]
-        result.loc[english_day, 'HPC_Sessions'] = round(scale * annual_hpc_sessions / TIME['WEEKS_PER_YEAR'])
-        result.loc[english_day, 'NCS_Sessions'] = round(scale * annual_ncs_sessions / TIME['WEEKS_PER_YEAR'])
+    sessions = _scale_weekdays(weekly_counts, annual_hpc_sessions, annual_ncs_sessions)
+    result = pd.DataFrame(sessions, index=[DAY_MAPPING[day] for day in GERMAN_DAYS],
+                          columns=['HPC_Sessions', 'NCS_Sessions'])
     
-    result.loc['Total', 'HPC_Sessions'] = result['HPC_Sessions'].sum()
-    result.loc['Total', 'NCS_Sessions'] = result['NCS_Sessions'].sum()
+    # Append the totals of both columns as one row
+    result.loc['Total'] = result.sum()
     
     return result
\ No newline at end of file
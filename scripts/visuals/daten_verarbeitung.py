@@ -1,48 +1,47 @@
 import json
 import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+def load_grid_energy(file_id):
+    """Read the grid_energy values from the optimization result of one ID."""
+    # Try to find file (look in results directory relative to project root)
+    file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
+                            "results", f"optimization_{file_id}_T_min_noBat.json")
+    
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    
+    # Extract grid_energy
+    return data.get('results', {}).get('grid_energy', [])
 
 def main():
     # Specific file IDs we're interested in
     file_ids = ["930", "935", "940", "945"]
     
-    # Collect grid_energy data for each file
-    data_by_file = {}
-    
-    for file_id in file_ids:
-        # Try to find file (look in results directory relative to project root)
-        file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                "results", f"optimization_{file_id}_T_min_noBat.json")
+    # Write each file's row as soon as it is read instead of collecting all rows first
+    output_file = 'analyse.csv'
+    with open(output_file, 'w', newline='') as out, ThreadPoolExecutor(max_workers=4) as executor:
+        writer = csv.writer(out)
         
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Extract grid_energy
-            grid_energy = data.get('results', {}).get('grid_energy', [])
-            data_by_file[file_id] = grid_energy
-            print(f"Extracted grid_energy data from ID {file_id}: {len(grid_energy)} values")
+        # The files are independent, so they are read concurrently; rows are
+        # still written sorted by ID
+        sorted_ids = sorted(file_ids)
+        futures = [executor.submit(load_grid_energy, file_id) for file_id in sorted_ids]
+        
+        for file_id, future in zip(sorted_ids, futures):
+            try:
+                grid_energy = future.result()
+                print(f"Extracted grid_energy data from ID {file_id}: {len(grid_energy)} values")
+                
+            except Exception as e:
+                print(f"Error reading file for ID {file_id}: {e}")
+                continue
             
-        except Exception as e:
-            print(f"Error reading file for ID {file_id}: {e}")
-    
-    # Prepare CSV rows
-    csv_rows = []
-    
-    # Add data rows (sorted by ID)
-    for file_id in sorted(data_by_file.keys()):
-        grid_energy = data_by_file[file_id]
-        # Create row with ID first, then all grid_energy values
-        row = [file_id] + grid_energy
-        csv_rows.append(row)
-    
-    # Write to CSV
-    output_file = 'analyse.csv'
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerows(csv_rows)
+            # Row with ID first, then all grid_energy values
+            writer.writerow([file_id, *grid_energy])
     
     print(f"Data saved to {output_file}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -11,8 +11,14 @@ import json
 import logging
 import threading
 import time
-import re
+import io
+import codecs
+import locale
+import traceback
+import shutil
+import tempfile
 import datetime
+from collections import deque
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, send_from_directory, send_file
 from flask_socketio import SocketIO, emit
@@ -47,8 +53,12 @@ except ImportError:
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 
-# Create unique log filename with timestamp
-timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+# Create unique log filename with timestamp. The reloader child inherits the
+# parent's timestamp, so one session writes a single log file.
+timestamp = os.environ.setdefault(
+    'CHARGING_HUB_UI_LOG_TIMESTAMP',
+    datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+)
 log_file = log_dir/f'gui_log_{timestamp}.txt'
 
 logging.basicConfig(
@@ -62,60 +72,287 @@ logger = logging.getLogger(__name__)
 # Initialize Flask app and SocketIO
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'charginghub-secret-key'
-socketio = SocketIO(app)
+# Debugger and reloader are opt-in; the reloader imports this module twice
+UI_DEBUG = os.environ.get('CHARGING_HUB_UI_DEBUG') == '1'
+
+def select_async_mode():
+    """Pick the Socket.IO async mode, preferring eventlet when it is installed"""
+    # CHARGING_HUB_UI_ASYNC_MODE overrides the choice, e.g. 'threading'
+    requested = os.environ.get('CHARGING_HUB_UI_ASYNC_MODE')
+    if requested:
+        return requested
+    try:
+        import eventlet
+        return 'eventlet'
+    except ImportError:
+        return 'threading'
+
+socketio = SocketIO(app, async_mode=select_async_mode())
+
+# Compress JSON and HTML responses when Flask-Compress is installed; the
+# config, logs and maps endpoints return sizeable JSON
+try:
+    from flask_compress import Compress
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+    app.config['COMPRESS_MIN_SIZE'] = 512
+    Compress(app)
+except ImportError:
+    logger.info("flask_compress not installed, responses are sent uncompressed")
 
 # Global variables for process management
 active_processes = {}
 process_logs = {}
 
-# Helper function to read the latest log entries
-def get_latest_logs(log_file, num_lines=50):
+# Number of output lines kept per process for the status endpoint
+PROCESS_LOG_MAX_LINES = 5000
+
+# Size of the blocks read backwards from the end of a log file
+LOG_TAIL_BLOCK_SIZE = 64 * 1024
+
+# Helper function to read the latest log entries; end limits the read to the
+# first end bytes of the file
+def get_latest_logs(log_file, num_lines=50, end=None):
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-            return lines[-num_lines:]
+        with open(log_file, 'rb') as f:
+            # Read blocks backwards from the end until they hold more than
+            # num_lines line breaks, instead of reading the whole file
+            f.seek(0, os.SEEK_END)
+            start = f.tell() if end is None else min(end, f.tell())
+            data = b''
+            while start > 0 and (num_lines <= 0 or data.count(b'\n') <= num_lines):
+                size = min(LOG_TAIL_BLOCK_SIZE, start)
+                start -= size
+                f.seek(start)
+                data = f.read(size) + data
+            
+            # Drop the partial line in front of the first complete one
+            if start > 0:
+                data = data[data.index(b'\n') + 1:]
+        
+        # Decode and split lines like a text-mode readlines()
+        text = data.decode(locale.getpreferredencoding(False))
+        lines = io.StringIO(text, newline=None).readlines()
+        return lines[-num_lines:]
     except Exception as e:
         logger.error(f"Error reading log file {log_file}: {e}")
         return [f"Error reading log file: {str(e)}"]
 
+# (mtime, size) of config.py when the Config module was last reloaded
+_config_stamp = None
+
+# Cached /api/config response body, with the config stamp it was built at
+_config_payload = None
+
 # Function to reload configuration
 def reload_config():
-    """Reload the Config module to get the latest changes"""
-    global Config
+    """Reload the Config module if config.py changed since the last reload"""
+    global Config, _config_stamp
     try:
+        # Skip the reload while the file is unchanged
+        stat = os.stat(config_module_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == _config_stamp:
+            return True
+        
         # Reload the config module
         import importlib
         import scripts.config
         importlib.reload(scripts.config)
         Config = scripts.config.Config
+        _config_stamp = stamp
         logger.info("Config module reloaded successfully")
         return True
     except Exception as e:
         logger.error(f"Error reloading config module: {e}")
         return False
 
-def update_config_file(settings):
+def write_file_atomic(path, content):
+    """
+    Replace a text file in one step via a temporary file in the same directory
+    
+    Args:
+        path (str): Path of the file to replace
+        content (str): New content of the file
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        # Keep the permissions of the original file instead of the private temp file mode
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+# Transformer applying new settings to the parsed config.py, defined once
+# instead of on every save
+class ConfigTransformer(ast.NodeTransformer):
+    """Apply new settings to the section assignments of the Config class"""
+    
+    def __init__(self, settings):
+        super().__init__()
+        self.settings = settings
+    
+    def visit_ClassDef(self, node):
+        # Only process the Config class
+        if node.name == 'Config':
+            # Process class body
+            for i, item in enumerate(node.body):
+                # Look for assignments
+                if isinstance(item, ast.Assign):
+                    # Check if this is a section we want to modify
+                    if len(item.targets) == 1 and isinstance(item.targets[0], ast.Name):
+                        section_name = item.targets[0].id
+                        if section_name in self.settings:
+                            # Update the value based on its type
+                            item.value = self.transform_value(item.value, self.settings[section_name], 
+                                                              path=[section_name])
+        return node
+
+    def transform_value(self, node, new_value, path=None):
+        """
+        Recursively transform an AST node based on new_value.
+
+        Args:
+            node: The existing AST node
+            new_value: The new value to apply
+            path: List representing the current path in the config hierarchy
+
+        Returns:
+            Updated AST node
+        """
+        path = path or []
+        current_path = '.'.join(path)
+
+        # Handle dictionaries recursively
+        if isinstance(node, ast.Dict) and isinstance(new_value, dict):
+            # Process each key-value pair in the dict
+            for j, (key, value) in enumerate(zip(node.keys, node.values)):
+                if isinstance(key, ast.Str) and key.s in new_value:
+                    node_path = path + [key.s]
+                    node.values[j] = self.transform_value(value, new_value[key.s], node_path)
+            return node
+
+        # Handle lists recursively
+        elif isinstance(node, ast.List) and isinstance(new_value, list):
+            # If the list has the same length, update each element
+            if len(node.elts) == len(new_value):
+                for j, (elt, new_elt) in enumerate(zip(node.elts, new_value)):
+                    node_path = path + [f"[{j}]"]
+                    node.elts[j] = self.create_node_for_value(new_elt, node_path)
+            else:
+                # If lengths differ, create a new list
+                return self.create_node_for_value(new_value, path)
+            return node
+
+        # Handle tuples recursively
+        elif isinstance(node, ast.Tuple) and isinstance(new_value, (list, tuple)):
+            # Convert tuple to the right size
+            if len(node.elts) == len(new_value):
+                for j, (elt, new_elt) in enumerate(zip(node.elts, new_value)):
+                    node_path = path + [f"[{j}]"]
+                    node.elts[j] = self.create_node_for_value(new_elt, node_path)
+            else:
+                # If lengths differ, create a new tuple
+                return self.create_node_for_value(new_value, path)
+            return node
+
+        # Handle special case: os.path.join() for TRAFFIC_PATHS
+        elif (isinstance(node, ast.Call) and 
+              current_path.startswith('TRAFFIC_PATHS') and
+              isinstance(node.func, ast.Attribute) and 
+              node.func.attr == 'join' and 
+              hasattr(node.func.value, 'attr') and 
+              node.func.value.attr == 'path'):
+
+            # For path joins, update the last argument while preserving the structure
+            if isinstance(new_value, str) and len(node.args) > 0:
+                # Split the new path and update the last component
+                path_parts = new_value.split('/')
+                if len(path_parts) > 0:
+                    last_part = path_parts[-1]
+                    # Keep the original path structure but update the final folder
+                    if isinstance(node.args[-1], ast.Str):
+                        node.args[-1] = ast.Str(s=last_part)
+            return node
+
+        # For all other nodes, create an appropriate AST node based on the new value
+        return self.create_node_for_value(new_value, path)
+
+    def create_node_for_value(self, value, path=None):
+        """
+        Create an appropriate AST node for a given value.
+
+        Args:
+            value: The value to convert to an AST node
+            path: List representing the current path in the config hierarchy
+
+        Returns:
+            AST node representing the value
+        """
+        path = path or []
+        current_path = '.'.join(path)
+
+        # Handle different value types
+        if isinstance(value, bool):
+            return ast.NameConstant(value=value)
+        elif isinstance(value, int):
+            return ast.Num(n=value)
+        elif isinstance(value, float):
+            return ast.Num(n=value)
+        elif isinstance(value, str):
+            return ast.Str(s=value)
+        elif isinstance(value, dict):
+            # Create a new dictionary node
+            keys = []
+            values = []
+            for k, v in value.items():
+                keys.append(ast.Str(s=k))
+                node_path = path + [k]
+                values.append(self.create_node_for_value(v, node_path))
+            return ast.Dict(keys=keys, values=values)
+        elif isinstance(value, list):
+            # Create a new list node
+            elts = []
+            for i, item in enumerate(value):
+                node_path = path + [f"[i]"]
+                elts.append(self.create_node_for_value(item, node_path))
+            return ast.List(elts=elts, ctx=ast.Load())
+        elif isinstance(value, tuple):
+            # Create a new tuple node
+            elts = []
+            for i, item in enumerate(value):
+                node_path = path + [f"[i]"]
+                elts.append(self.create_node_for_value(item, node_path))
+            return ast.Tuple(elts=elts, ctx=ast.Load())
+        elif value is None:
+            return ast.NameConstant(value=None)
+        else:
+            # For unsupported types, convert to string
+            return ast.Str(s=str(value))
+
+def update_config_file(settings, reload=True):
     """
     Update the config.py file with new settings using AST (Abstract Syntax Tree)
     
     Args:
         settings (dict): Dictionary containing the new settings
+        reload (bool): Reload the Config module after writing the file. The
+            in-memory Config already holds the new values, and reload_config()
+            picks up the file change on its next call anyway.
     
     Returns:
         bool: True if successful, False otherwise
     """
+    global _config_payload, _config_stamp
     logger.info(f"Updating config.py with settings: {settings}")
     
+    # Only set once a backup of this save exists, so a failure never restores
+    # a stale backup
+    backup_path = None
     try:
-        # Create a backup of the config file
-        backup_path = f"{config_module_path}.bak"
-        with open(config_module_path, 'r') as f:
-            original_content = f.read()
-            
-        # Save backup
-        with open(backup_path, 'w') as f:
-            f.write(original_content)
-        
         # Special handling for TIME dictionary
         if 'TIME' in settings:
             # Get current TIME values from Config
@@ -253,175 +490,47 @@ def update_config_file(settings):
         
         # If changes were made, we need to update the file
         if changes_made:
+            # The cached /api/config response no longer matches Config
+            _config_payload = None
+            
+            # Read config.py and create a backup, only when it will be rewritten
+            with open(config_module_path, 'r') as f:
+                original_content = f.read()
+            with open(f"{config_module_path}.bak", 'w') as f:
+                f.write(original_content)
+            backup_path = f"{config_module_path}.bak"
             
             # Parse the original code into an AST
             tree = ast.parse(original_content)
             
-            # Define a transformer to modify the AST
-            class ConfigTransformer(ast.NodeTransformer):
-                def visit_ClassDef(self, node):
-                    # Only process the Config class
-                    if node.name == 'Config':
-                        # Process class body
-                        for i, item in enumerate(node.body):
-                            # Look for assignments
-                            if isinstance(item, ast.Assign):
-                                # Check if this is a section we want to modify
-                                if len(item.targets) == 1 and isinstance(item.targets[0], ast.Name):
-                                    section_name = item.targets[0].id
-                                    if section_name in settings:
-                                        # Update the value based on its type
-                                        item.value = self.transform_value(item.value, settings[section_name], 
-                                                                         path=[section_name])
-                    return node
-                
-                def transform_value(self, node, new_value, path=None):
-                    """
-                    Recursively transform an AST node based on new_value.
-                    
-                    Args:
-                        node: The existing AST node
-                        new_value: The new value to apply
-                        path: List representing the current path in the config hierarchy
-                    
-                    Returns:
-                        Updated AST node
-                    """
-                    path = path or []
-                    current_path = '.'.join(path)
-                    
-                    # Handle dictionaries recursively
-                    if isinstance(node, ast.Dict) and isinstance(new_value, dict):
-                        # Process each key-value pair in the dict
-                        for j, (key, value) in enumerate(zip(node.keys, node.values)):
-                            if isinstance(key, ast.Str) and key.s in new_value:
-                                node_path = path + [key.s]
-                                node.values[j] = self.transform_value(value, new_value[key.s], node_path)
-                        return node
-                    
-                    # Handle lists recursively
-                    elif isinstance(node, ast.List) and isinstance(new_value, list):
-                        # If the list has the same length, update each element
-                        if len(node.elts) == len(new_value):
-                            for j, (elt, new_elt) in enumerate(zip(node.elts, new_value)):
-                                node_path = path + [f"[{j}]"]
-                                node.elts[j] = self.create_node_for_value(new_elt, node_path)
-                        else:
-                            # If lengths differ, create a new list
-                            return self.create_node_for_value(new_value, path)
-                        return node
-                    
-                    # Handle tuples recursively
-                    elif isinstance(node, ast.Tuple) and isinstance(new_value, (list, tuple)):
-                        # Convert tuple to the right size
-                        if len(node.elts) == len(new_value):
-                            for j, (elt, new_elt) in enumerate(zip(node.elts, new_value)):
-                                node_path = path + [f"[{j}]"]
-                                node.elts[j] = self.create_node_for_value(new_elt, node_path)
-                        else:
-                            # If lengths differ, create a new tuple
-                            return self.create_node_for_value(new_value, path)
-                        return node
-                    
-                    # Handle special case: os.path.join() for TRAFFIC_PATHS
-                    elif (isinstance(node, ast.Call) and 
-                          current_path.startswith('TRAFFIC_PATHS') and
-                          isinstance(node.func, ast.Attribute) and 
-                          node.func.attr == 'join' and 
-                          hasattr(node.func.value, 'attr') and 
-                          node.func.value.attr == 'path'):
-                        
-                        # For path joins, update the last argument while preserving the structure
-                        if isinstance(new_value, str) and len(node.args) > 0:
-                            # Split the new path and update the last component
-                            path_parts = new_value.split('/')
-                            if len(path_parts) > 0:
-                                last_part = path_parts[-1]
-                                # Keep the original path structure but update the final folder
-                                if isinstance(node.args[-1], ast.Str):
-                                    node.args[-1] = ast.Str(s=last_part)
-                        return node
-                    
-                    # For all other nodes, create an appropriate AST node based on the new value
-                    return self.create_node_for_value(new_value, path)
-                
-                def create_node_for_value(self, value, path=None):
-                    """
-                    Create an appropriate AST node for a given value.
-                    
-                    Args:
-                        value: The value to convert to an AST node
-                        path: List representing the current path in the config hierarchy
-                    
-                    Returns:
-                        AST node representing the value
-                    """
-                    path = path or []
-                    current_path = '.'.join(path)
-                    
-                    # Handle different value types
-                    if isinstance(value, bool):
-                        return ast.NameConstant(value=value)
-                    elif isinstance(value, int):
-                        return ast.Num(n=value)
-                    elif isinstance(value, float):
-                        return ast.Num(n=value)
-                    elif isinstance(value, str):
-                        return ast.Str(s=value)
-                    elif isinstance(value, dict):
-                        # Create a new dictionary node
-                        keys = []
-                        values = []
-                        for k, v in value.items():
-                            keys.append(ast.Str(s=k))
-                            node_path = path + [k]
-                            values.append(self.create_node_for_value(v, node_path))
-                        return ast.Dict(keys=keys, values=values)
-                    elif isinstance(value, list):
-                        # Create a new list node
-                        elts = []
-                        for i, item in enumerate(value):
-                            node_path = path + [f"[i]"]
-                            elts.append(self.create_node_for_value(item, node_path))
-                        return ast.List(elts=elts, ctx=ast.Load())
-                    elif isinstance(value, tuple):
-                        # Create a new tuple node
-                        elts = []
-                        for i, item in enumerate(value):
-                            node_path = path + [f"[i]"]
-                            elts.append(self.create_node_for_value(item, node_path))
-                        return ast.Tuple(elts=elts, ctx=ast.Load())
-                    elif value is None:
-                        return ast.NameConstant(value=None)
-                    else:
-                        # For unsupported types, convert to string
-                        return ast.Str(s=str(value))
-            
             # Apply our transformer
-            new_tree = ConfigTransformer().visit(tree)
+            new_tree = ConfigTransformer(settings).visit(tree)
             ast.fix_missing_locations(new_tree)
             
             # Convert the modified AST back to code
             new_code = astor.to_source(new_tree)
             
-            # Write the modified code back to the file
-            with open(config_module_path, 'w') as f:
-                f.write(new_code)
+            # Write the modified code back to the file; readers such as a
+            # starting run see either the old or the new file, never a partial one
+            write_file_atomic(config_module_path, new_code)
             
             # Reload the config module to apply changes
-            reload_config()
+            if reload:
+                reload_config()
             logger.info("Configuration file updated successfully")
             return True
         else:
-            logger.warning("No changes were made to the configuration")
-            return False
+            # Saving unchanged settings is not an error; config.py is left
+            # untouched and Config does not need a reload
+            logger.info("Configuration unchanged, config.py was not rewritten")
+            return True
             
     except Exception as e:
         logger.error(f"Error updating config file: {e}")
         logger.exception("Detailed traceback:")
         # Try to restore from backup if it exists
         try:
-            if os.path.exists(backup_path):
+            if backup_path and os.path.exists(backup_path):
                 with open(backup_path, 'r') as f:
                     backup_content = f.read()
                 with open(config_module_path, 'w') as f:
@@ -429,18 +538,66 @@ def update_config_file(settings):
                 logger.info("Restored config file from backup after error")
         except Exception as restore_error:
             logger.error(f"Failed to restore config from backup: {restore_error}")
+        
+        # Config may already hold settings that never reached config.py, and
+        # the file stamp alone would not show that; force a reload from disk
+        _config_stamp = None
+        _config_payload = None
+        reload_config()
         return False
 
 
+# Output lines are sent to the client in batches of at most this many lines,
+# held back for at most this many seconds
+OUTPUT_BATCH_MAX_LINES = 32
+OUTPUT_BATCH_MAX_DELAY = 0.05
+
+class OutputBatcher:
+    """Collect the output lines of one process and emit them in batches"""
+    
+    def __init__(self, process_id):
+        self.process_id = process_id
+        self.lines = []
+        self.lock = threading.Lock()
+        self.timer = None
+    
+    def add(self, line):
+        """Queue a line; a full batch is sent at once, others after a short delay"""
+        with self.lock:
+            self.lines.append(line)
+            if len(self.lines) >= OUTPUT_BATCH_MAX_LINES:
+                self._emit()
+            elif self.timer is None:
+                self.timer = threading.Timer(OUTPUT_BATCH_MAX_DELAY, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+    
+    def flush(self):
+        """Send all queued lines now"""
+        with self.lock:
+            self._emit()
+    
+    def _emit(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.lines:
+            lines, self.lines = self.lines, []
+            socketio.emit('process_output', {'id': self.process_id, 'lines': lines})
+
+# Number of bytes read from a process pipe at a time
+PROCESS_READ_CHUNK_SIZE = 64 * 1024
+
 # Helper function to run a command and stream output to client
-def run_command_with_output(process_id, cmd, cwd=None, env=None):
-    process_logs[process_id] = []
+def run_command_with_output(process_id, cmd, cwd=None, env_overrides=None):
+    process_logs[process_id] = deque(maxlen=PROCESS_LOG_MAX_LINES)
+    output = OutputBatcher(process_id)
 
     def run_and_stream():
         logger.info(f"Starting process {process_id}: {cmd}")
         
-        # Use the provided environment or copy the current environment
-        process_env = env if env else os.environ.copy()
+        # Only the variables that differ from the UI's own environment
+        overrides = env_overrides or {}
         
         # For Python scripts, use a different approach to ensure all output is captured
         if isinstance(cmd, str) and (cmd.startswith(sys.executable) or 'python' in cmd.lower()):
@@ -451,10 +608,8 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
             script_args = parts[2:] if len(parts) > 2 else []
             
             # Import the module and redirect stdout/stderr to capture all output
-            import io
             import contextlib
             from importlib import util
-            import traceback
             
             # Create a custom stdout/stderr redirector
             class StreamCapture(io.StringIO):
@@ -479,11 +634,18 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
             stdout_capture = StreamCapture()
             stderr_capture = StreamCapture()
             
+            # Every line emitted so far; the bounded log cannot tell which
+            # lines of the captured output were already sent
+            emitted_lines = set()
+            
             # Add handlers to process the output
             def handle_output(line):
+                emitted_lines.add(line)
                 process_logs[process_id].append(line)
-                socketio.emit('process_output', {'id': process_id, 'output': line})
-                logger.debug(f"Process {process_id} output: {line}")
+                output.add(line)
+                # Skip building the message unless debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Process {process_id} output: {line}")
             
             stdout_capture.output_handlers.append(handle_output)
             stderr_capture.output_handlers.append(handle_output)
@@ -501,9 +663,7 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                 
                 # Set up the environment
                 orig_env = os.environ.copy()
-                if process_env:
-                    for key, value in process_env.items():
-                        os.environ[key] = value
+                os.environ.update(overrides)
                 
                 # Redirect stdout and stderr
                 with contextlib.redirect_stdout(stdout_capture), contextlib.redirect_stderr(stderr_capture):
@@ -527,9 +687,12 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                     # Restore sys.argv
                     sys.argv = orig_argv
                 
-                # Restore environment
-                os.environ.clear()
-                os.environ.update(orig_env)
+                # Restore environment, touching only the variables that changed
+                for key in os.environ.keys() - orig_env.keys():
+                    del os.environ[key]
+                for key, value in orig_env.items():
+                    if os.environ.get(key) != value:
+                        os.environ[key] = value
                 
                 # Restore working directory
                 if cwd:
@@ -542,14 +705,15 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
             
             # Get any remaining output from the captures
             for line in stdout_capture.getvalue().splitlines():
-                if line.strip() and line.strip() not in process_logs[process_id]:
+                if line.strip() and line.strip() not in emitted_lines:
                     handle_output(line.strip())
             
             for line in stderr_capture.getvalue().splitlines():
-                if line.strip() and line.strip() not in process_logs[process_id]:
+                if line.strip() and line.strip() not in emitted_lines:
                     handle_output(line.strip())
             
             # Emit process completed event
+            output.flush()
             socketio.emit('process_completed', {
                 'id': process_id,
                 'exitCode': exit_code,
@@ -558,8 +722,14 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
             
         else:
             # For non-Python commands, use the standard subprocess approach
+            process = None
             try:
-                # Run the command with the appropriate settings based on platform
+                # The child gets the UI environment plus the overrides
+                process_env = {**os.environ, **overrides}
+                
+                # Run the command with the appropriate settings based on platform.
+                # Output is read as raw bytes in large chunks and split into
+                # lines here, instead of through a line-buffered text pipe.
                 if isinstance(cmd, str):
                     if sys.platform == 'win32':
                         # On Windows, use shell=True to find the executable
@@ -567,8 +737,7 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                             cmd, 
                             stdout=subprocess.PIPE,
                             stderr=subprocess.STDOUT,
-                            universal_newlines=True,
-                            bufsize=1,  # Line buffered
+                            bufsize=0,
                             shell=True,
                             cwd=cwd,
                             env=process_env
@@ -579,8 +748,7 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                             cmd.split(), 
                             stdout=subprocess.PIPE,
                             stderr=subprocess.STDOUT,
-                            universal_newlines=True,
-                            bufsize=1,  # Line buffered
+                            bufsize=0,
                             shell=False,
                             cwd=cwd,
                             env=process_env
@@ -591,8 +759,7 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                         cmd, 
                         stdout=subprocess.PIPE,
                         stderr=subprocess.STDOUT,
-                        universal_newlines=True,
-                        bufsize=1,  # Line buffered
+                        bufsize=0,
                         shell=False,
                         cwd=cwd,
                         env=process_env
@@ -602,16 +769,30 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                 
                 socketio.emit('process_started', {'id': process_id})
                 
-                # Read from stdout line by line to ensure we capture everything
-                for line in iter(process.stdout.readline, ''):
-                    if not line:
-                        break
-                    
+                def handle_line(line):
                     line = line.strip()
                     if line:
                         process_logs[process_id].append(line)
-                        socketio.emit('process_output', {'id': process_id, 'output': line})
-                        logger.debug(f"Process {process_id} stdout: {line}")
+                        output.add(line)
+                        # Skip building the message unless debug logging is on
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Process {process_id} stdout: {line}")
+                
+                # Decode like a text-mode pipe, with \r\n and \r read as \n
+                decoder = io.IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder(locale.getpreferredencoding(False))(), translate=True)
+                pending = ''
+                stdout_fd = process.stdout.fileno()
+                while True:
+                    chunk = os.read(stdout_fd, PROCESS_READ_CHUNK_SIZE)
+                    *lines, pending = (pending + decoder.decode(chunk, final=not chunk)).split('\n')
+                    for line in lines:
+                        handle_line(line)
+                    if not chunk:
+                        break
+                
+                # The last line may not end with a newline
+                handle_line(pending)
                 
                 # Process finished, get exit code
                 process.wait()
@@ -619,6 +800,7 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                 logger.info(f"Process {process_id} completed with exit code {exit_code}")
                 
                 # Emit process completed event
+                output.flush()
                 socketio.emit('process_completed', {
                     'id': process_id,
                     'exitCode': exit_code,
@@ -630,10 +812,16 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
                 traceback_str = traceback.format_exc()
                 logger.error(f"Traceback: {traceback_str}")
                 
+                # Nothing drains the pipe any more, so do not leave the child running
+                if process is not None and process.poll() is None:
+                    process.kill()
+                    process.wait()
+                
                 error_message = f"Error executing process: {str(e)}"
                 process_logs[process_id].append(error_message)
-                socketio.emit('process_output', {'id': process_id, 'output': error_message})
+                output.add(error_message)
                 
+                output.flush()
                 socketio.emit('process_completed', {
                     'id': process_id,
                     'exitCode': 1,
@@ -645,6 +833,31 @@ def run_command_with_output(process_id, cmd, cwd=None, env=None):
     thread.start()
     return True
 
+# Directory listings by path, with the directory mtime they were read at
+_directory_listings = {}
+
+def list_directory(directory):
+    """
+    List the entries of a directory, re-reading it only when it changed.
+    
+    Adding, removing or renaming an entry changes the directory's mtime, so
+    the cached names stay valid until then. File contents and mtimes are not
+    cached, as rewriting a file does not touch the directory.
+    
+    Args:
+        directory: Path of the directory
+    
+    Returns:
+        list: Entry names in os.listdir order
+    """
+    key = os.fspath(directory)
+    stamp = os.stat(key).st_mtime_ns
+    cached = _directory_listings.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, os.listdir(key))
+        _directory_listings[key] = cached
+    return cached[1]
+
 # Route for the home page
 @app.route('/')
 def index():
@@ -663,23 +876,24 @@ def map_page():
     map_files = []
     
     if map_dir.exists():
-        # Get all HTML files in the maps directory
-        map_files = list(map_dir.glob('*.html'))
+        # Get all HTML files in the maps directory, with one stat per file
+        map_files = [(name, (map_dir / name).stat().st_mtime) for name in list_directory(map_dir)
+                     if name.endswith('.html') and not name.startswith('.')]
         
         # Categorize maps by type
-        combined_maps = [f for f in map_files if 'combined' in f.name.lower()]
-        power_line_maps = [f for f in map_files if 'power' in f.name.lower() or 'line' in f.name.lower()]
-        substation_maps = [f for f in map_files if 'substation' in f.name.lower()]
+        combined_maps = [f for f in map_files if 'combined' in f[0].lower()]
+        power_line_maps = [f for f in map_files if 'power' in f[0].lower() or 'line' in f[0].lower()]
+        substation_maps = [f for f in map_files if 'substation' in f[0].lower()]
         
         # Sort each category by modification time (newest first)
         for map_list in [combined_maps, power_line_maps, substation_maps]:
-            map_list.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            map_list.sort(key=lambda x: x[1], reverse=True)
         
         # Create a dictionary with the most recent map of each type
         latest_maps = {
-            'combined': combined_maps[0].name if combined_maps else None,
-            'power_line': power_line_maps[0].name if power_line_maps else None,
-            'substation': substation_maps[0].name if substation_maps else None
+            'combined': combined_maps[0][0] if combined_maps else None,
+            'power_line': power_line_maps[0][0] if power_line_maps else None,
+            'substation': substation_maps[0][0] if substation_maps else None
         }
     else:
         latest_maps = {
@@ -691,21 +905,21 @@ def map_page():
     # Get all map files for the dropdown
     all_maps = []
     if map_dir.exists():
-        for map_file in map_dir.glob('*.html'):
+        for name, mtime in map_files:
             map_type = None
-            if 'combined' in map_file.name.lower():
+            if 'combined' in name.lower():
                 map_type = 'Combined Map'
-            elif 'power' in map_file.name.lower() or 'line' in map_file.name.lower():
+            elif 'power' in name.lower() or 'line' in name.lower():
                 map_type = 'Power Line Map'
-            elif 'substation' in map_file.name.lower():
+            elif 'substation' in name.lower():
                 map_type = 'Substation Map'
             else:
                 map_type = 'Other Map'
                 
             all_maps.append({
-                'name': map_file.name,
+                'name': name,
                 'type': map_type,
-                'date': datetime.datetime.fromtimestamp(map_file.stat().st_mtime).strftime('%Y-%m-%d %H:%M')
+                'date': datetime.datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
             })
             
         # Sort by date (newest first)
@@ -788,7 +1002,7 @@ def configuration():
 def logs():
     # Get available log files
     log_files = []
-    for file in os.listdir(log_dir):
+    for file in list_directory(log_dir):
         if file.endswith('.log') or file.endswith('.txt'):
             log_files.append({
                 'name': file,
@@ -872,12 +1086,64 @@ def get_log_content(log_name):
         return jsonify({'error': 'Log file not found'}), 404
     
     try:
-        lines = get_latest_logs(log_path, 500)
-        return jsonify({'content': lines})
+        # The offset lets the client stream the lines written after this tail
+        offset = os.path.getsize(log_path)
+        lines = get_latest_logs(log_path, 500, end=offset)
+        return jsonify({'content': lines, 'offset': offset})
     except Exception as e:
         logger.error(f"Error reading log file: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Seconds between checks for new log lines, and between keep-alive comments
+# that let the server notice clients that went away
+LOG_STREAM_POLL_INTERVAL = 0.5
+LOG_STREAM_KEEPALIVE_INTERVAL = 15
+
+# API route to stream new log lines as Server-Sent Events
+@app.route('/api/logs/<log_name>/stream')
+def stream_log_content(log_name):
+    log_path = os.path.join(log_dir, log_name)
+    if not os.path.exists(log_path):
+        return jsonify({'error': 'Log file not found'}), 404
+    
+    # Start where the client's tail ended, or at the current end of the file
+    offset = request.args.get('offset', type=int)
+    if offset is None:
+        offset = os.path.getsize(log_path)
+    
+    def generate():
+        position = offset
+        pending = ''
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors='replace'), translate=True)
+        last_sent = time.monotonic()
+        with open(log_path, 'rb') as f:
+            while True:
+                # Only the bytes appended since the last read are read
+                if os.fstat(f.fileno()).st_size < position:
+                    # The file was truncated; start over from its beginning
+                    position = 0
+                    pending = ''
+                    decoder.reset()
+                f.seek(position)
+                chunk = f.read()
+                position = f.tell()
+                
+                if chunk:
+                    *lines, pending = (pending + decoder.decode(chunk)).split('\n')
+                    if lines:
+                        last_sent = time.monotonic()
+                        yield ''.join(f"data: {line}\n\n" for line in lines)
+                elif time.monotonic() - last_sent >= LOG_STREAM_KEEPALIVE_INTERVAL:
+                    last_sent = time.monotonic()
+                    yield ": keep-alive\n\n"
+                else:
+                    # socketio.sleep yields to other greenthreads under eventlet
+                    socketio.sleep(LOG_STREAM_POLL_INTERVAL)
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # API route to save configuration
 @app.route('/api/config/save', methods=['POST'])
 def save_config():
@@ -916,19 +1182,26 @@ def save_config():
 @app.route('/api/config')
 def get_config():
     try:
+        global _config_payload
+        
         # Reload config to ensure we have the latest
         reload_config()
         
-        return jsonify({
-            'success': True,
-            'config': {
-                'CHARGING_CONFIG': Config.CHARGING_CONFIG,
-                'EXECUTION_FLAGS': Config.EXECUTION_FLAGS,
-                'DEFAULT_LOCATION': Config.DEFAULT_LOCATION,
-                'RESULT_NAMING': Config.RESULT_NAMING,
-                'BATTERY_CONFIG': Config.BATTERY_CONFIG
-            }
-        })
+        # Serialize only after a reload or a settings update
+        if _config_payload is None or _config_payload[0] != _config_stamp:
+            response = jsonify({
+                'success': True,
+                'config': {
+                    'CHARGING_CONFIG': Config.CHARGING_CONFIG,
+                    'EXECUTION_FLAGS': Config.EXECUTION_FLAGS,
+                    'DEFAULT_LOCATION': Config.DEFAULT_LOCATION,
+                    'RESULT_NAMING': Config.RESULT_NAMING,
+                    'BATTERY_CONFIG': Config.BATTERY_CONFIG
+                }
+            })
+            _config_payload = (_config_stamp, response.get_data())
+        
+        return app.response_class(_config_payload[1], mimetype='application/json')
     except Exception as e:
         logger.error(f"Error getting configuration: {e}")
         return jsonify({'error': str(e)}), 500
@@ -940,18 +1213,16 @@ def run_main():
         # Get any configuration updates from the request
         config_updates = request.json.get('config', {})
         if config_updates:
-            # Update configuration before running
-            update_config_file(config_updates)
-        
-        # Prepare environment
-        env = os.environ.copy()
+            # Update configuration before running; the script imports the
+            # new config.py itself, so the UI does not need to reload it now
+            update_config_file(config_updates, reload=False)
         
         # Use python from sys.executable to ensure we use the same Python as the UI
         python_exec = sys.executable
         cmd = f"{python_exec} {os.path.join(scripts_dir, 'main.py')}"
         
         # Run from project root
-        run_command_with_output('main', cmd, cwd=parent_dir, env=env)
+        run_command_with_output('main', cmd, cwd=parent_dir)
         return jsonify({'success': True, 'processId': 'main'})
     except Exception as e:
         logger.error(f"Error running main.py: {e}")
@@ -964,20 +1235,22 @@ def run_traffic():
         # Get any configuration updates from the request
         config_updates = request.json.get('config', {})
         if config_updates:
-            # Update configuration before running
-            update_config_file(config_updates)
+            # Update configuration before running; the script imports the
+            # new config.py itself, so the UI does not need to reload it now
+            update_config_file(config_updates, reload=False)
         
         # Set environment variables to run only traffic calculation
-        env = os.environ.copy()
-        env['CHARGING_HUB_RUN_TRAFFIC_CALCULATION'] = '1'
-        env['CHARGING_HUB_RUN_CHARGING_HUB_SETUP'] = '0'
-        env['CHARGING_HUB_RUN_GRID_OPTIMIZATION'] = '0'
+        env = {
+            'CHARGING_HUB_RUN_TRAFFIC_CALCULATION': '1',
+            'CHARGING_HUB_RUN_CHARGING_HUB_SETUP': '0',
+            'CHARGING_HUB_RUN_GRID_OPTIMIZATION': '0',
+        }
         
         # Use python from sys.executable to ensure we use the same Python as the UI
         python_exec = sys.executable
         cmd = f"{python_exec} {os.path.join(scripts_dir, 'main.py')}"
         
-        run_command_with_output('traffic', cmd, cwd=parent_dir, env=env)
+        run_command_with_output('traffic', cmd, cwd=parent_dir, env_overrides=env)
         return jsonify({'success': True, 'processId': 'traffic'})
     except Exception as e:
         logger.error(f"Error running traffic calculation: {e}")
@@ -989,20 +1262,22 @@ def run_charging_hub_setup():
         # Get any configuration updates from the request
         config_updates = request.json.get('config', {})
         if config_updates:
-            # Update configuration before running
-            update_config_file(config_updates)
+            # Update configuration before running; the script imports the
+            # new config.py itself, so the UI does not need to reload it now
+            update_config_file(config_updates, reload=False)
         
         # Set environment variables to run only charging hub setup
-        env = os.environ.copy()
-        env['CHARGING_HUB_RUN_TRAFFIC_CALCULATION'] = '0'
-        env['CHARGING_HUB_RUN_CHARGING_HUB_SETUP'] = '1'
-        env['CHARGING_HUB_RUN_GRID_OPTIMIZATION'] = '0'
+        env = {
+            'CHARGING_HUB_RUN_TRAFFIC_CALCULATION': '0',
+            'CHARGING_HUB_RUN_CHARGING_HUB_SETUP': '1',
+            'CHARGING_HUB_RUN_GRID_OPTIMIZATION': '0',
+        }
         
         # Use python from sys.executable to ensure we use the same Python as the UI
         python_exec = sys.executable
         cmd = f"{python_exec} {os.path.join(scripts_dir, 'main.py')}"
         
-        run_command_with_output('charging_hub', cmd, cwd=parent_dir, env=env)
+        run_command_with_output('charging_hub', cmd, cwd=parent_dir, env_overrides=env)
         return jsonify({'success': True, 'processId': 'charging_hub'})
     except Exception as e:
         logger.error(f"Error running charging hub setup: {e}")
@@ -1014,14 +1289,16 @@ def run_grid_optimization():
         # Get any configuration updates from the request
         config_updates = request.json.get('config', {})
         if config_updates:
-            # Update configuration before running
-            update_config_file(config_updates)
+            # Update configuration before running; the script imports the
+            # new config.py itself, so the UI does not need to reload it now
+            update_config_file(config_updates, reload=False)
         
         # Set environment variables to run only grid optimization
-        env = os.environ.copy()
-        env['CHARGING_HUB_RUN_TRAFFIC_CALCULATION'] = '0'
-        env['CHARGING_HUB_RUN_CHARGING_HUB_SETUP'] = '0'
-        env['CHARGING_HUB_RUN_GRID_OPTIMIZATION'] = '1'
+        env = {
+            'CHARGING_HUB_RUN_TRAFFIC_CALCULATION': '0',
+            'CHARGING_HUB_RUN_CHARGING_HUB_SETUP': '0',
+            'CHARGING_HUB_RUN_GRID_OPTIMIZATION': '1',
+        }
         
         # If custom ID is provided in the configuration, pass it to the subprocess
         if Config.RESULT_NAMING.get('USE_CUSTOM_ID', False):
@@ -1042,7 +1319,7 @@ def run_grid_optimization():
         python_exec = sys.executable
         cmd = f"{python_exec} {os.path.join(scripts_dir, 'main.py')}"
         
-        run_command_with_output('grid_opt', cmd, cwd=parent_dir, env=env)
+        run_command_with_output('grid_opt', cmd, cwd=parent_dir, env_overrides=env)
         return jsonify({'success': True, 'processId': 'grid_opt'})
     except Exception as e:
         logger.error(f"Error running grid optimization: {e}")
@@ -1052,14 +1329,14 @@ def run_grid_optimization():
 @app.route('/api/process/<process_id>/status')
 def get_process_status(process_id):
     if process_id not in active_processes:
-        return jsonify({'running': False, 'logs': process_logs.get(process_id, [])})
+        return jsonify({'running': False, 'logs': list(process_logs.get(process_id, []))})
     
     process = active_processes[process_id]
     is_running = process.poll() is None
     
     return jsonify({
         'running': is_running,
-        'logs': process_logs.get(process_id, [])
+        'logs': list(process_logs.get(process_id, []))
     })
 
 # API route to stop a process
@@ -1072,8 +1349,10 @@ def stop_process(process_id):
     if process.poll() is None:  # Process still running
         try:
             process.terminate()
-            time.sleep(1)
-            if process.poll() is None:  # Still running after terminate
+            try:
+                # Returns as soon as the process exits
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:  # Still running after terminate
                 process.kill()
             logger.info(f"Process {process_id} stopped by user")
             return jsonify({'success': True})
@@ -1091,4 +1370,4 @@ if __name__ == '__main__':
     print(f"Log file: {log_file}")
     
     # Start the server
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    socketio.run(app, host='0.0.0.0', port=5000, debug=UI_DEBUG)
\ No newline at end of file
@@ -23,7 +23,7 @@ scripts_dir = os.path.join(parent_dir, 'scripts')
 sys.path.append(scripts_dir)
 
 # Import app and configs
-from app import app, socketio
+from app import app, socketio, UI_DEBUG
 
 def open_browser():
     """
@@ -47,10 +47,10 @@ if __name__ == '__main__':
     # Start browser in a new thread
     threading.Thread(target=open_browser).start()
     
-    # Set default config for development
-    app.config['DEBUG'] = True
+    # Debug mode only when requested with CHARGING_HUB_UI_DEBUG=1
+    app.config['DEBUG'] = UI_DEBUG
     
     # Start Flask app with Socket.IO
     print("Starting ChargingHub Optimization UI at http://localhost:5000")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True, use_reloader=True)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=UI_DEBUG, use_reloader=UI_DEBUG)
 
@@ -108,11 +108,14 @@ document.addEventListener('DOMContentLoaded', function() {
     
     socket.on('process_output', function(data) {
         if (activeProcesses[data.id]) {
-            activeProcesses[data.id].output.push(data.output);
-            appendToTerminal(data.output);
-            
-            // Parse output for progress indicators
-            parseProgressFromOutput(data.id, data.output);
+            // Output arrives in batches of lines
+            data.lines.forEach(function(line) {
+                activeProcesses[data.id].output.push(line);
+                appendToTerminal(line);
+                
+                // Parse output for progress indicators
+                parseProgressFromOutput(data.id, line);
+            });
         }
     });
     
@@ -97,12 +97,14 @@ document.addEventListener('DOMContentLoaded', function() {
     // Process output handling
     socket.on('process_output', function(data) {
         // This event is emitted when a process produces output
-        if (data.id && data.output) {
+        if (data.id && data.lines && data.lines.length) {
             // Find output containers for this process
             const containers = document.querySelectorAll(`[data-process-output-id="${data.id}"]`);
             
+            // Output arrives in batches of lines
+            const text = data.lines.join('\n') + '\n';
             containers.forEach(container => {
-                container.innerHTML += data.output + '\n';
+                container.innerHTML += text;
                 container.scrollTop = container.scrollHeight;
             });
         }